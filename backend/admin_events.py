@@ -0,0 +1,237 @@
+"""Live project request changes for admin clients.
+
+Write paths record compact events (created / status_changed / deleted) in
+``project_request_events`` inside their own transaction, so an event exists
+exactly when its change committed. Each worker polls the table for new ids
+(woken immediately after its own commits) and fans every event out to its
+admin sockets through bounded per-client queues. A client that falls behind
+is disconnected and reconnects with ``last_event_id``; the missed events are
+replayed from the table, so reconnects don't need a full list reload.
+
+Ids are handed out before commit on PostgreSQL and MSSQL, so a lower id can
+become visible after a higher one. The poller only moves past a missing id
+once ``ADMIN_EVENTS_GAP_TIMEOUT`` has passed (it may belong to a rolled back
+transaction); until then later events are held back, so every event is
+delivered in id order and ``last_event_id`` stays a safe resume point.
+"""
+import asyncio
+import json
+import logging
+import os
+from typing import Optional, Set
+
+from fastapi import WebSocket, status
+from sqlalchemy import delete, func, insert, select
+
+from serialization import json_default
+
+logger = logging.getLogger("resume.admin_events")
+
+ADMIN_EVENTS_POLL_INTERVAL = float(os.getenv("ADMIN_EVENTS_POLL_INTERVAL", "0.5"))  # seconds
+ADMIN_EVENTS_QUEUE_SIZE = int(os.getenv("ADMIN_EVENTS_QUEUE_SIZE", "256"))  # per client
+ADMIN_EVENTS_RETAIN = int(os.getenv("ADMIN_EVENTS_RETAIN", "10000"))  # events kept for resume
+ADMIN_EVENTS_REPLAY_LIMIT = int(os.getenv("ADMIN_EVENTS_REPLAY_LIMIT", "1000"))
+ADMIN_EVENTS_PRUNE_INTERVAL = float(os.getenv("ADMIN_EVENTS_PRUNE_INTERVAL", "60"))
+ADMIN_EVENTS_GAP_TIMEOUT = float(os.getenv("ADMIN_EVENTS_GAP_TIMEOUT", "2"))  # seconds to wait for a missing id
+
+# Columns the admin list renders; the description is fetched on demand
+REQUEST_EVENT_FIELDS = ("id", "name", "email", "project_type", "status", "created_at")
+
+
+def request_summary(row) -> dict:
+    """List-view fields of an ORM row or an inserted row dict"""
+    if isinstance(row, dict):
+        return {field: row.get(field) for field in REQUEST_EVENT_FIELDS}
+    return {field: getattr(row, field) for field in REQUEST_EVENT_FIELDS}
+
+
+class AdminClient:
+    __slots__ = ("websocket", "queue", "last_sent_id")
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.last_sent_id = 0
+
+
+class AdminEventHub:
+    """Records events and streams them to this worker's admin sockets"""
+
+    def __init__(self, event_model, session_factory, send_timeout: float,
+                 poll_interval: float = ADMIN_EVENTS_POLL_INTERVAL, queue_size: int = ADMIN_EVENTS_QUEUE_SIZE,
+                 retain: int = ADMIN_EVENTS_RETAIN, replay_limit: int = ADMIN_EVENTS_REPLAY_LIMIT,
+                 gap_timeout: float = ADMIN_EVENTS_GAP_TIMEOUT):
+        self.event_model = event_model
+        self.session_factory = session_factory
+        self.send_timeout = send_timeout
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.retain = retain
+        self.replay_limit = replay_limit
+        self.gap_timeout = gap_timeout
+        self.clients: Set[AdminClient] = set()
+        self.delivered = 0
+        self.overflows = 0
+        self._cursor: Optional[int] = None  # last event id fanned out; None while nobody listens
+        self._gap_since: Optional[float] = None  # when the poller first saw the id after the cursor missing
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def record(self, db, event_type: str, **fields):
+        """Add an event inside the caller's transaction; call ``notify()`` after commit"""
+        await db.execute(insert(self.event_model).values(
+            type=event_type, payload=json.dumps(fields, default=json_default, separators=(",", ":"))
+        ))
+
+    def notify(self):
+        self._wake.set()
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def serve(self, websocket: WebSocket, last_event_id: Optional[int] = None):
+        """Stream events to an accepted, authenticated socket until it disconnects"""
+        latest = await self._max_id()
+        if not self.clients:
+            self._cursor = max(self._cursor or 0, latest)
+        client = AdminClient(websocket, self.queue_size)
+        # Fresh clients load the list themselves. A resuming client has seen up to last_event_id; the
+        # replay covers what the poller already passed and the live stream brings the rest
+        client.last_sent_id = latest if last_event_id is None else last_event_id
+        # Register before replaying so nothing committed in between is missed; duplicates are skipped by id
+        self.clients.add(client)
+        try:
+            if last_event_id is not None:
+                replay = await self._replay(last_event_id)
+                if replay is None:
+                    client.last_sent_id = latest  # the client reloads the list instead
+                    await websocket.send_text(json.dumps({"type": "reset"}))
+                else:
+                    for event_id, text in replay:
+                        await websocket.send_text(text)
+                        client.last_sent_id = event_id
+            await websocket.send_text(json.dumps({"type": "ready", "last_event_id": client.last_sent_id}))
+
+            sender = asyncio.create_task(self._send_loop(client))
+            receiver = asyncio.create_task(self._receive_loop(websocket))
+            done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            for task in done:
+                task.exception()  # a disconnect ends the stream; nothing to report
+        except Exception:
+            pass
+        finally:
+            self.clients.discard(client)
+            if not self.clients:
+                self._cursor = None
+                self._gap_since = None
+
+    async def _send_loop(self, client: AdminClient):
+        while True:
+            event_id, text = await client.queue.get()
+            if event_id is None:
+                # Fell behind: let the client reconnect and resume from the table
+                await client.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+            if event_id <= client.last_sent_id:
+                continue
+            await asyncio.wait_for(client.websocket.send_text(text), timeout=self.send_timeout)
+            client.last_sent_id = event_id
+
+    async def _receive_loop(self, websocket: WebSocket):
+        # Nothing is expected from the client; this just notices disconnects
+        while True:
+            await websocket.receive_text()
+
+    def _encode(self, event_id: int, event_type: str, payload: str) -> str:
+        return json.dumps({"id": event_id, "type": event_type, **json.loads(payload)})
+
+    async def _max_id(self) -> int:
+        async with self.session_factory() as db:
+            return (await db.execute(select(func.max(self.event_model.id)))).scalar() or 0
+
+    async def _replay(self, last_event_id: int):
+        """Events after ``last_event_id``, or None if the client must reload instead"""
+        event = self.event_model
+        async with self.session_factory() as db:
+            oldest, newest = (await db.execute(select(func.min(event.id), func.max(event.id)))).one()
+            if last_event_id > (newest or 0) or (oldest is not None and oldest > last_event_id + 1):
+                return None  # unknown id (e.g. fresh database) or already pruned
+            query = select(event.id, event.type, event.payload).where(event.id > last_event_id)
+            if self._cursor is not None:
+                # Anything newer comes through the poller, in order with events still committing
+                query = query.where(event.id <= self._cursor)
+            rows = (await db.execute(query.order_by(event.id).limit(self.replay_limit + 1))).all()
+        if len(rows) > self.replay_limit:
+            return None
+        return [(row.id, self._encode(row.id, row.type, row.payload)) for row in rows]
+
+    def _fan_out(self, event_id: int, text: str):
+        for client in list(self.clients):
+            try:
+                client.queue.put_nowait((event_id, text))
+            except asyncio.QueueFull:
+                self.overflows += 1
+                while not client.queue.empty():
+                    client.queue.get_nowait()
+                client.queue.put_nowait((None, None))
+        self.delivered += 1
+
+    async def _poll(self):
+        event = self.event_model
+        while self._cursor is not None:
+            async with self.session_factory() as db:
+                rows = (await db.execute(
+                    select(event.id, event.type, event.payload).where(event.id > self._cursor)
+                    .order_by(event.id).limit(500)
+                )).all()
+            if self._cursor is None:
+                return  # everyone left while we were reading
+            for row in rows:
+                if row.id > self._cursor + 1:
+                    now = asyncio.get_running_loop().time()
+                    if self._gap_since is None:
+                        self._gap_since = now
+                    if now - self._gap_since < self.gap_timeout:
+                        return  # a lower id may still commit; the next poll looks again
+                self._gap_since = None
+                self._fan_out(row.id, self._encode(row.id, row.type, row.payload))
+                self._cursor = row.id
+            if len(rows) < 500:
+                return
+
+    async def _prune(self):
+        event = self.event_model
+        async with self.session_factory() as db:
+            newest = (await db.execute(select(func.max(event.id)))).scalar()
+            if newest is not None and newest > self.retain:
+                await db.execute(delete(event).where(event.id <= newest - self.retain))
+                await db.commit()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_prune = loop.time()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                if self.clients:
+                    await self._poll()
+                if loop.time() >= next_prune:
+                    next_prune = loop.time() + ADMIN_EVENTS_PRUNE_INTERVAL
+                    await self._prune()
+            except Exception as e:
+                logger.warning(f"⚠️ Admin event polling failed: {e}")
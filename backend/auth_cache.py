@@ -0,0 +1,54 @@
+"""Cache of verified bearer tokens for the admin API.
+
+A hit skips both the JWT decode and the users lookup. Entries never outlive
+the token's own ``exp`` and are dropped when the user they belong to changes.
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "60"))  # seconds a verified token is trusted
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+
+
+class TokenCache:
+    """Bounded LRU of token -> principal with per-entry expiry"""
+
+    def __init__(self, ttl: float = TOKEN_CACHE_TTL, max_size: int = TOKEN_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[Any]:
+        entry = self._entries.get(token)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self._entries[token]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry[2]
+
+    def set(self, token: str, subject: str, principal: Any, token_expires_at: float):
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        expires_at = min(time.time() + self.ttl, token_expires_at)
+        self._entries[token] = (expires_at, subject, principal)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate_subject(self, subject: str):
+        """Forget every token issued to ``subject``, e.g. after a password change"""
+        for token in [token for token, entry in self._entries.items() if entry[1] == subject]:
+            del self._entries[token]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,515 @@
+"""Mixed-workload benchmark for the whole API, saved as JSON for comparison.
+
+Virtual users loop over a weighted mix of operations for a fixed time while
+a pool of /ws/online-users sockets stays open:
+
+- submit: public POST /api/project-requests
+- login: POST /api/auth/login (scrypt, so keep its weight low)
+- list / get / patch / delete: admin routes with a shared bearer token
+- static: /, /portfolio, /admin and the stylesheets
+
+The app runs against a throwaway, migrated and seeded SQLite file, either
+in-process (``--mode inprocess``: httpx ASGI transport, sockets driven over
+ASGI directly, one event loop shared with the clients) or as a real server
+(``--mode uvicorn``: a subprocess with ``--workers``; sockets use the
+``websockets`` client that ships with uvicorn[standard]).
+
+Reported: throughput and p50/p95/p99 per operation, socket connect latency,
+event-loop lag (in-process: a 5 ms ticker on the shared loop; uvicorn: the
+latency of a /health probe, as seen by a client), and RSS of the process
+serving the app (start, peak, end; all uvicorn processes summed). Results
+go to ``--output`` as JSON with the git commit; ``--compare`` prints the
+change against an earlier result file.
+
+Usage:
+    python benchmarks/bench_api.py --duration 20 --users 50 --sockets 2000
+    python benchmarks/bench_api.py --mode uvicorn --workers 2 --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DB_DIR = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{BENCH_DB_DIR}/bench.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")  # measure the endpoints, not the limiter
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx  # noqa: E402
+
+DEFAULT_MIX = "submit=30,static=30,list=15,get=10,patch=8,delete=4,login=3"
+STATIC_PATHS = ["/", "/portfolio", "/admin", "/styles.css", "/portfolio.css"]
+STATUSES = ["pending", "in_progress", "completed", "rejected"]
+ADMIN_LOGIN = {"username": "admin", "password": "admin123"}
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return None
+    return round(values[max(int(len(values) * pct) - 1, 0)] * 1000, 2)
+
+
+def summarize(values) -> dict:
+    return {"p50_ms": percentile(values, 0.50), "p95_ms": percentile(values, 0.95),
+            "p99_ms": percentile(values, 0.99), "max_ms": percentile(values, 1.0)}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}, expected one of {sorted(OPERATIONS)}")
+        mix[name] = float(weight)
+    return mix
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def rss_bytes(pids: List[int]) -> int:
+    """Resident memory of ``pids`` and all their descendants (Linux /proc)"""
+    total, seen, stack = 0, set(), list(pids)
+    while stack:
+        pid = stack.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        try:
+            with open(f"/proc/{pid}/status") as status_file:
+                for line in status_file:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+            with open(f"/proc/{pid}/task/{pid}/children") as children_file:
+                stack.extend(int(child) for child in children_file.read().split())
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+    return total
+
+
+# --- Setup ---
+
+def prepare_database(seed_rows: int):
+    """Migrate the throwaway database and seed requests for the admin routes to work on"""
+    from sqlalchemy import insert
+
+    from database import engine
+    from migrations import upgrade
+    from models import ProjectRequest
+
+    upgrade(engine)
+    rng = random.Random(1)
+    with engine.begin() as connection:
+        for start in range(0, seed_rows, 5000):
+            connection.execute(insert(ProjectRequest), [
+                {
+                    "name": f"Seed {i}",
+                    "email": f"seed{i}@example.com",
+                    "project_description": "Seeded request for the benchmark. " * rng.randint(1, 8),
+                    "project_type": rng.choice(["web", "mobile", "bot", None]),
+                    "status": rng.choice(STATUSES),
+                }
+                for i in range(start, min(start + 5000, seed_rows))
+            ])
+    engine.dispose()
+
+
+class ASGIWebSocket:
+    """In-process WebSocket client that talks ASGI to the app directly"""
+
+    def __init__(self, app, path: str):
+        self.app = app
+        self.path = path
+        self._to_app: asyncio.Queue = asyncio.Queue()
+        self._from_app: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def connect(self):
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "http_version": "1.1",
+            "path": self.path, "raw_path": self.path.encode(), "query_string": b"", "root_path": "",
+            "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+            "subprotocols": [],
+        }
+        await self._to_app.put({"type": "websocket.connect"})
+        self._task = asyncio.create_task(self.app(scope, self._to_app.get, self._from_app.put))
+        message = await self._from_app.get()
+        if message["type"] != "websocket.accept":
+            raise ConnectionError(f"socket rejected: {message}")
+        return self
+
+    async def recv(self) -> str:
+        message = await self._from_app.get()
+        if message["type"] == "websocket.close":
+            raise ConnectionError("socket closed by the app")
+        return message.get("text") or message.get("bytes")
+
+    async def close(self):
+        await self._to_app.put({"type": "websocket.disconnect", "code": 1000})
+        try:
+            await asyncio.wait_for(self._task, timeout=5)
+        except Exception:
+            pass
+
+
+class Target:
+    """Where the app runs: clients to reach it and pids to measure"""
+
+    def __init__(self, mode: str, workers: int, users: int):
+        self.mode = mode
+        self.workers = workers
+        self.users = users
+        self.process: Optional[subprocess.Popen] = None
+        self.app = None
+        self.base_url = "http://bench"
+
+    async def start(self):
+        if self.mode == "inprocess":
+            import main
+            self.app = main.app
+            await self.app.router.startup()
+            return
+        port = int(os.getenv("BENCH_PORT", "8765"))
+        self.base_url = f"http://127.0.0.1:{port}"
+        env = dict(os.environ, LOG_LEVEL=os.getenv("LOG_LEVEL", "WARNING"))
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(self.workers), "--log-level", "warning", "--no-access-log"],
+            cwd=BACKEND_DIR, env=env,
+        )
+        async with httpx.AsyncClient(base_url=self.base_url) as client:
+            for _ in range(300):
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        return
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.1)
+        raise RuntimeError("uvicorn did not come up within 30s")
+
+    async def stop(self):
+        if self.app is not None:
+            await self.app.router.shutdown()
+            from database import engine
+            engine.dispose()
+        if self.process is not None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(max_connections=self.users + 10, max_keepalive_connections=self.users + 10)
+        if self.app is not None:
+            return httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app), base_url=self.base_url,
+                                     timeout=60)
+        return httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=60)
+
+    async def open_socket(self, path: str):
+        if self.app is not None:
+            return await ASGIWebSocket(self.app, path).connect()
+        import websockets
+        return await websockets.connect(self.base_url.replace("http", "ws", 1) + path, open_timeout=30,
+                                        ping_interval=None)
+
+    def rss(self) -> int:
+        return rss_bytes([self.process.pid if self.process is not None else os.getpid()])
+
+
+# --- Operations; each returns the response status ---
+
+class Context:
+    def __init__(self, client: httpx.AsyncClient, headers: dict, ids: List[int]):
+        self.client = client
+        self.headers = headers
+        self.ids = ids
+
+
+async def submit(ctx: Context, rng: random.Random):
+    response = await ctx.client.post("/api/project-requests", json={
+        "name": "Bench Client",
+        "email": f"bench{rng.randint(1, 10 ** 6)}@example.com",
+        "project_description": "Benchmark submission " * rng.randint(2, 20),
+        "budget": rng.choice(["$1000", "$5000", None]),
+        "project_type": rng.choice(["web", "mobile", "bot", None]),
+    })
+    if response.status_code == 200:
+        ctx.ids.append(response.json()["id"])
+    return response.status_code
+
+
+async def login(ctx: Context, rng: random.Random):
+    return (await ctx.client.post("/api/auth/login", json=ADMIN_LOGIN)).status_code
+
+
+async def list_requests(ctx: Context, rng: random.Random):
+    params = {"limit": 50}
+    if rng.random() < 0.3:
+        params["status"] = rng.choice(STATUSES)
+    return (await ctx.client.get("/api/project-requests", params=params, headers=ctx.headers)).status_code
+
+
+async def get_request(ctx: Context, rng: random.Random):
+    request_id = rng.choice(ctx.ids) if ctx.ids else 1
+    return (await ctx.client.get(f"/api/project-requests/{request_id}", headers=ctx.headers)).status_code
+
+
+async def patch_request(ctx: Context, rng: random.Random):
+    request_id = rng.choice(ctx.ids) if ctx.ids else 1
+    return (await ctx.client.patch(f"/api/project-requests/{request_id}", json={"status": rng.choice(STATUSES)},
+                                   headers=ctx.headers)).status_code
+
+
+async def delete_request(ctx: Context, rng: random.Random):
+    if not ctx.ids:
+        return 404
+    request_id = ctx.ids.pop(rng.randrange(len(ctx.ids)))
+    return (await ctx.client.delete(f"/api/project-requests/{request_id}", headers=ctx.headers)).status_code
+
+
+async def static_page(ctx: Context, rng: random.Random):
+    return (await ctx.client.get(rng.choice(STATIC_PATHS), headers={"Accept-Encoding": "gzip, br"})).status_code
+
+
+OPERATIONS = {
+    "submit": submit,
+    "login": login,
+    "list": list_requests,
+    "get": get_request,
+    "patch": patch_request,
+    "delete": delete_request,
+    "static": static_page,
+}
+
+
+# --- Run ---
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {name: [] for name in OPERATIONS}
+        self.statuses: Dict[str, Counter] = {name: Counter() for name in OPERATIONS}
+
+    def record(self, name: str, seconds: float, status):
+        self.latencies[name].append(seconds)
+        self.statuses[name][str(status)] += 1
+
+
+async def hold_sockets(target: Target, count: int, stop: asyncio.Event, result: dict):
+    """Open ``count`` sockets in batches, keep them reading until ``stop``, then close them"""
+    connect_latencies, sockets = [], []
+    received = Counter()
+
+    async def open_one():
+        started = time.perf_counter()
+        try:
+            socket = await target.open_socket("/ws/online-users")
+            await socket.recv()  # the current count arrives right after the accept
+            connect_latencies.append(time.perf_counter() - started)
+            received["messages"] += 1
+            sockets.append(socket)
+        except Exception:
+            received["failed"] += 1
+
+    async def read(socket):
+        try:
+            while True:
+                await socket.recv()
+                received["messages"] += 1
+        except Exception:
+            pass
+
+    for start in range(0, count, 200):
+        await asyncio.gather(*(open_one() for _ in range(min(200, count - start))))
+        if stop.is_set():
+            break
+    readers = [asyncio.create_task(read(socket)) for socket in sockets]
+    result.update({"target": count, "connected": len(sockets), "failed": received["failed"],
+                   "connect": summarize(connect_latencies)})
+    await stop.wait()
+    for task in readers:
+        task.cancel()
+    await asyncio.gather(*readers, return_exceptions=True)
+    closed_started = time.perf_counter()
+    await asyncio.gather(*(socket.close() for socket in sockets), return_exceptions=True)
+    result.update({"messages_received": received["messages"],
+                   "close_all_ms": round((time.perf_counter() - closed_started) * 1000, 1)})
+
+
+async def run(args) -> dict:
+    target = Target(args.mode, args.workers, args.users)
+    await target.start()
+    recorder = Recorder()
+    lags, probes, rss_samples = [], [], [target.rss()]
+    stop = asyncio.Event()
+    sockets: dict = {}
+    names, weights = list(args.mix), list(args.mix.values())
+
+    try:
+        async with target.client() as client:
+            token = (await client.post("/api/auth/login", json=ADMIN_LOGIN)).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            ids = (await client.get("/api/project-requests", params={"limit": 1000}, headers=headers)).json()
+            ctx = Context(client, headers, [row["id"] for row in ids])
+
+            async def ticker():
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    await asyncio.sleep(0.005)
+                    lags.append(time.perf_counter() - started - 0.005)
+
+            async def probe():
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    await client.get("/health")
+                    probes.append(time.perf_counter() - started)
+                    await asyncio.sleep(0.05)
+
+            async def sample_memory():
+                while not stop.is_set():
+                    rss_samples.append(target.rss())
+                    await asyncio.sleep(0.25)
+
+            background = [asyncio.create_task(sample_memory()), asyncio.create_task(probe())]
+            if args.mode == "inprocess":
+                background.append(asyncio.create_task(ticker()))
+            socket_task = asyncio.create_task(hold_sockets(target, args.sockets, stop, sockets))
+
+            measure_from = time.perf_counter() + args.warmup
+            deadline = measure_from + args.duration
+
+            async def virtual_user(seed: int):
+                rng = random.Random(seed)
+                while True:
+                    started = time.perf_counter()
+                    if started >= deadline:
+                        return
+                    name = rng.choices(names, weights)[0]
+                    try:
+                        status = await OPERATIONS[name](ctx, rng)
+                    except Exception as e:
+                        status = type(e).__name__
+                    if started >= measure_from:
+                        recorder.record(name, time.perf_counter() - started, status)
+
+            await asyncio.gather(*(virtual_user(args.seed + i) for i in range(args.users)))
+            stop.set()
+            await socket_task
+            await asyncio.gather(*background)
+            rss_samples.append(target.rss())
+    finally:
+        stop.set()
+        await target.stop()
+
+    operations = {}
+    total = errors = 0
+    for name in names:
+        latencies, statuses = recorder.latencies[name], recorder.statuses[name]
+        failed = sum(n for status, n in statuses.items() if not status.isdigit() or int(status) >= 500)
+        total += len(latencies)
+        errors += failed
+        operations[name] = {
+            "count": len(latencies),
+            "rps": round(len(latencies) / args.duration, 1),
+            "errors": failed,
+            "statuses": dict(statuses),
+            **summarize(latencies),
+        }
+    lag_source = "ticker" if args.mode == "inprocess" else "health_probe"
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "overall": {"requests": total, "rps": round(total / args.duration, 1), "errors": errors},
+        "operations": operations,
+        "sockets": sockets,
+        "event_loop_lag": {"source": lag_source, **summarize(lags if lags else probes)},
+        "health_probe": summarize(probes),
+        "memory_mb": {
+            "start": round(rss_samples[0] / 2 ** 20, 1),
+            "peak": round(max(rss_samples) / 2 ** 20, 1),
+            "end": round(rss_samples[-1] / 2 ** 20, 1),
+        },
+    }
+
+
+def print_report(result: dict, baseline: Optional[dict] = None):
+    overall = result["overall"]
+    print(f"commit {result['meta']['commit']}  mode {result['meta']['args']['mode']}  "
+          f"{overall['requests']} requests  {overall['rps']} req/s  {overall['errors']} errors")
+    print(f"{'operation':<10}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}   statuses")
+    for name, stats in result["operations"].items():
+        line = f"{name:<10}{stats['rps']:>9}{stats['p50_ms'] or 0:>9}{stats['p95_ms'] or 0:>9}{stats['p99_ms'] or 0:>9}"
+        old = (baseline or {}).get("operations", {}).get(name)
+        if old and old.get("rps") and old.get("p95_ms"):
+            line += f"   [{change(stats['rps'], old['rps'])} req/s, {change(stats['p95_ms'], old['p95_ms'])} p95]"
+        print(f"{line}   {stats['statuses']}")
+    sockets = result["sockets"]
+    if sockets:
+        print(f"sockets   {sockets['connected']}/{sockets['target']} connected, connect p95 "
+              f"{sockets['connect']['p95_ms']} ms, {sockets.get('messages_received', 0)} messages")
+    lag = result["event_loop_lag"]
+    print(f"loop lag  ({lag['source']}) p50 {lag['p50_ms']} ms  p99 {lag['p99_ms']} ms  max {lag['max_ms']} ms")
+    memory = result["memory_mb"]
+    print(f"memory    start {memory['start']} MB  peak {memory['peak']} MB  end {memory['end']} MB")
+
+
+def change(new: float, old: float) -> str:
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (uvicorn mode)")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds run before measuring")
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--sockets", type=int, default=1000, help="/ws/online-users sockets held open")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help=f"operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--seed-rows", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=None, help="result file (default bench_api_<commit>_<mode>.json)")
+    parser.add_argument("--compare", default=None, help="earlier result file to diff against")
+    args = parser.parse_args()
+    if isinstance(args.mix, str):
+        args.mix = parse_mix(args.mix)
+
+    prepare_database(args.seed_rows)
+    result = asyncio.run(run(args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(result, baseline)
+    output = args.output or f"bench_api_{result['meta']['commit']}_{args.mode}.json"
+    with open(output, "w") as output_file:
+        json.dump(result, output_file, indent=2)
+    print(f"saved {output}")
+
+
+if __name__ == "__main__":
+    main_cli()
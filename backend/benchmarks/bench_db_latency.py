@@ -0,0 +1,118 @@
+"""Latency benchmark for the async database path under mixed load.
+
+Runs the app in-process against a throwaway SQLite file. Concurrent clients
+submit project requests and list them as admin, while a probe hits /health.
+The probe latency shows how long the event loop is held by DB work.
+``--blocking`` adds the old pattern (sync session inside an async route)
+as a baseline for the same workload.
+
+Usage:
+    python benchmarks/bench_db_latency.py --clients 50 --requests 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")  # measure the endpoints, not the limiter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from database import SessionLocal, async_engine, engine, read_async_engine  # noqa: E402
+from migrations import upgrade  # noqa: E402
+from models import ProjectRequest  # noqa: E402
+
+
+@main.app.post("/bench/blocking-project-requests")
+async def blocking_create(request: main.ProjectRequestCreate):
+    """The pre-async pattern: a sync session used directly inside an async route"""
+    db = SessionLocal()
+    try:
+        db_request = ProjectRequest(**request.model_dump(), status="pending")
+        db.add(db_request)
+        db.commit()
+        db.refresh(db_request)
+        return {"id": db_request.id}
+    finally:
+        db.close()
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return round(values[max(int(len(values) * pct) - 1, 0)] * 1000, 2)
+
+
+async def run(create_path: str, clients: int, requests: int):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        token = (await client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        payload = {"name": "Bench", "email": "bench@example.com", "project_description": "x" * 200, "project_type": "web"}
+        latencies, probes = [], []
+        done = asyncio.Event()
+
+        async def worker(i):
+            for _ in range(requests):
+                started = time.perf_counter()
+                if i % 2:
+                    await client.post(create_path, json=payload)
+                else:
+                    await client.get("/api/project-requests", headers=headers)
+                latencies.append(time.perf_counter() - started)
+
+        async def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/health")
+                probes.append(time.perf_counter() - started)
+                await asyncio.sleep(0.005)
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    return {
+        "path": create_path,
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile(latencies, 0.50),
+        "p99_ms": percentile(latencies, 0.99),
+        "probe_p50_ms": percentile(probes, 0.50),
+        "probe_p99_ms": percentile(probes, 0.99),
+    }
+
+
+async def run_all(paths, clients: int, requests: int):
+    """Every path in one event loop; the async pools can't be carried over to a new one"""
+    try:
+        for path in paths:
+            print(await run(path, clients, requests))
+    finally:
+        # Pooled aiosqlite connections keep worker threads alive; close them before the loop goes away
+        await async_engine.dispose()
+        await read_async_engine.dispose()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--blocking", action="store_true", help="also run the sync-session baseline")
+    args = parser.parse_args()
+
+    upgrade(engine)
+
+    paths = ["/api/project-requests"] + (["/bench/blocking-project-requests"] if args.blocking else [])
+    asyncio.run(run_all(paths, args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,91 @@
+"""Request throughput of the landing page with logging off, queued and synchronous.
+
+``off`` is the default INFO level (per-request debug lines disabled),
+``queued`` enables them through the queue handler, and ``sync`` writes them
+with a flushed StreamHandler on the request path, like the old prints. Both
+logging modes use the same JSON formatter and write to the same sink: a pipe
+drained by a reader limited to ``--sink-rate`` bytes/s, standing in for a
+log collector that can't keep up. Once the pipe buffer is full a write
+blocks until the reader catches up; ``dropped`` counts the records the queue
+handler discarded instead of waiting.
+
+Usage:
+    python benchmarks/bench_logging.py --requests 5000 --sink-rate 200000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from logging_setup import ROOT_LOGGER, DroppingQueueHandler, JSONFormatter, configure_logging, stop_logging  # noqa: E402
+
+
+class FlushingHandler(logging.StreamHandler):
+    def emit(self, record):
+        super().emit(record)
+        self.flush()
+
+
+def slow_sink(rate: float, chunk: int = 4096):
+    """Write end of a pipe whose reader drains at most ``rate`` bytes/s"""
+    read_fd, write_fd = os.pipe()
+
+    def drain():
+        with os.fdopen(read_fd, "rb", buffering=0) as reader:
+            while reader.read(chunk):
+                time.sleep(chunk / rate)
+
+    threading.Thread(target=drain, daemon=True).start()
+    return os.fdopen(write_fd, "w")
+
+
+async def run(requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch():
+            async with semaphore:
+                await client.get("/")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch() for _ in range(requests)))
+        return requests / (time.perf_counter() - started)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--sink-rate", type=float, default=200000, help="bytes/s the log reader drains")
+    args = parser.parse_args()
+
+    with slow_sink(args.sink_rate) as sink:
+        asyncio.run(run(min(args.requests, 1000), args.concurrency))  # warm-up
+        for mode in ("off", "queued", "sync"):
+            configure_logging(level="DEBUG" if mode != "off" else "INFO", fmt="json", stream=sink)
+            if mode == "sync":
+                stop_logging()
+                handler = FlushingHandler(sink)
+                handler.setFormatter(JSONFormatter())
+                logging.getLogger(ROOT_LOGGER).handlers[:] = [handler]
+            dropped = DroppingQueueHandler.dropped
+            rps = asyncio.run(run(args.requests, args.concurrency))
+            print({"mode": mode, "requests_per_sec": round(rps, 1),
+                   "dropped": DroppingQueueHandler.dropped - dropped})
+            stop_logging()  # drains what the queued mode left behind before the next mode starts
+        configure_logging()
+
+
+if __name__ == "__main__":
+    main_cli()
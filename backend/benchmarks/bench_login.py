@@ -0,0 +1,99 @@
+"""Login throughput and event-loop lag at several scrypt cost settings.
+
+Runs the app in-process against a throwaway SQLite file and fires concurrent
+logins while a ticker measures how late the event loop wakes up.
+
+Usage:
+    python benchmarks/bench_login.py --costs 12 14 15 --logins 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")  # measure the endpoints, not the limiter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from database import SessionLocal, async_engine, engine, read_async_engine  # noqa: E402
+from migrations import upgrade  # noqa: E402
+from models import User  # noqa: E402
+from passwords import PasswordHasher  # noqa: E402
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return round(values[max(int(len(values) * pct) - 1, 0)] * 1000, 2)
+
+
+async def run(logins: int, concurrency: int):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        lags, statuses = [], []
+        done = asyncio.Event()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def ticker():
+            while not done.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lags.append(time.perf_counter() - started - 0.001)
+
+        async def login():
+            async with semaphore:
+                response = await client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+                statuses.append(response.status_code)
+
+        ticker_task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await ticker_task
+
+    return {
+        "logins_per_sec": round(logins / elapsed, 1),
+        "ok": statuses.count(200),
+        "busy": statuses.count(503),
+        "loop_lag_p50_ms": percentile(lags, 0.50),
+        "loop_lag_p99_ms": percentile(lags, 0.99),
+    }
+
+
+async def run_all(costs, logins: int, concurrency: int):
+    """Every cost in one event loop; the async pools can't be carried over to a new one"""
+    db = SessionLocal()
+    try:
+        for cost in costs:
+            main.password_hasher = PasswordHasher(n=2 ** cost)
+            admin = db.query(User).filter(User.username == "admin").first()
+            admin.password_hash = main.password_hasher.hash_sync("admin123")
+            db.commit()
+            result = await run(logins, concurrency)
+            print({"scrypt_n": f"2^{cost}", **result})
+            main.password_hasher.shutdown()
+    finally:
+        db.close()
+        # Pooled aiosqlite connections keep worker threads alive; close them before the loop goes away
+        await async_engine.dispose()
+        await read_async_engine.dispose()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--costs", type=int, nargs="+", default=[12, 14, 15], help="scrypt log2(N) values")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    upgrade(engine)
+    asyncio.run(run_all(args.costs, args.logins, args.concurrency))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,95 @@
+"""Load benchmark for the /ws/online-users broadcaster.
+
+Simulates thousands of sockets joining and leaving in a storm and reports
+how many sends were issued, CPU time and connect latency. A handful of the
+simulated clients never finish a send, to check they get dropped instead of
+stalling everyone else.
+
+Usage:
+    python benchmarks/bench_online_users.py --clients 5000 --stalled 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import ConnectionManager  # noqa: E402
+
+
+class FakeWebSocket:
+    """Bare minimum of the Starlette WebSocket API used by ConnectionManager"""
+
+    sends = 0
+
+    def __init__(self, stalled: bool = False):
+        self.stalled = stalled
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        FakeWebSocket.sends += 1
+        if self.stalled:
+            await asyncio.sleep(3600)
+        await asyncio.sleep(0)
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+
+async def run(clients: int, stalled: int, interval: float, timeout: float):
+    manager = ConnectionManager(broadcast_interval=interval, send_timeout=timeout)
+    sockets = [FakeWebSocket(stalled=i < stalled) for i in range(clients)]
+    latencies = []
+
+    FakeWebSocket.sends = 0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+
+    async def join(ws):
+        started = time.perf_counter()
+        await manager.connect(ws)
+        latencies.append(time.perf_counter() - started)
+
+    # Join storm, then half of the healthy clients leave again
+    await asyncio.gather(*(join(ws) for ws in sockets[stalled:]))
+    await asyncio.gather(*(join(ws) for ws in sockets[:stalled]))
+    for ws in sockets[stalled::2]:
+        manager.disconnect(ws)
+
+    # Let the broadcaster settle: coalesced ticks plus stalled-client timeouts
+    await asyncio.sleep(timeout + interval * 3)
+    await manager.stop()
+
+    return {
+        "clients": clients,
+        "stalled": stalled,
+        "final_count": len(manager.active_connections),
+        "sends": FakeWebSocket.sends,
+        "sends_per_client": round(FakeWebSocket.sends / clients, 2),
+        "cpu_seconds": round(time.process_time() - cpu_start, 3),
+        "wall_seconds": round(time.perf_counter() - wall_start, 3),
+        "connect_p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "connect_p99_ms": round(sorted(latencies)[int(len(latencies) * 0.99) - 1] * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1000, 2000, 5000])
+    parser.add_argument("--stalled", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=0.5)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    args = parser.parse_args()
+
+    for clients in args.clients:
+        print(asyncio.run(run(clients, args.stalled, args.interval, args.timeout)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Per-request cost of the rate limiter, and what it saves on rejected requests.
+
+Times ``hit()`` on the in-memory and SQLite stores across many client keys,
+then floods POST /api/project-requests from one client in-process and
+compares the latency of rejected requests with accepted ones.
+
+Usage:
+    python benchmarks/bench_rate_limit.py --hits 100000 --keys 50000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+tmp_dir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tmp_dir}/bench.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from database import engine  # noqa: E402
+from migrations import upgrade  # noqa: E402
+from rate_limit import MemoryRateLimitStore, RateLimit, SQLiteRateLimitStore  # noqa: E402
+
+
+async def time_store(store, hits: int, keys: int) -> dict:
+    limit = RateLimit(5, 60)
+    started = time.perf_counter()
+    for i in range(hits):
+        await store.hit(f"submit:10.0.{i % keys // 256}.{i % 256}", limit)
+    elapsed = time.perf_counter() - started
+    return {"store": type(store).__name__, "hits": hits, "keys": keys, "us_per_hit": round(elapsed / hits * 1e6, 2)}
+
+
+async def flood(requests: int) -> dict:
+    await main.startup_event()
+    payload = {"name": "Bench", "email": "bench@example.com", "project_description": "x" * 50}
+    latencies = {200: [], 429: []}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.post("/api/project-requests", json=payload)
+            latencies.setdefault(response.status_code, []).append(time.perf_counter() - started)
+    await main.shutdown_event()
+    return {
+        str(code): {"count": len(values), "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else None}
+        for code, values in latencies.items()
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hits", type=int, default=100000)
+    parser.add_argument("--keys", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    print(asyncio.run(time_store(MemoryRateLimitStore(), args.hits, args.keys)))
+    print(asyncio.run(time_store(MemoryRateLimitStore(max_keys=args.keys // 10), args.hits, args.keys)))
+    print(asyncio.run(time_store(SQLiteRateLimitStore(os.path.join(tmp_dir, "ratelimit.db")), args.hits // 10, args.keys)))
+    upgrade(engine)
+    print({"flood": asyncio.run(flood(args.requests))})
+
+
+if __name__ == "__main__":
+    main_cli()
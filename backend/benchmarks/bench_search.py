@@ -0,0 +1,96 @@
+"""Search latency at a few hundred thousand rows, FTS index vs LIKE scan.
+
+Fills a throwaway SQLite file with generated requests (the index is built by
+the insert triggers, as in production), then times the search query the
+endpoint runs for rare, common, prefix and multi-word queries, as shipped
+(broad queries sorted newest first) and with every query ranked.
+
+Usage:
+    python benchmarks/bench_search.py --rows 300000 --repeat 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+
+from database import AsyncReadSessionLocal, async_engine, engine, read_async_engine  # noqa: E402
+from migrations import upgrade  # noqa: E402
+from models import ProjectRequest  # noqa: E402
+from search import SEARCH_MAX_RANKED, LikeSearch, detect_search_backend, parse_terms, search  # noqa: E402
+
+COMMON = ["website", "app", "design", "build", "need", "online", "shop", "mobile", "data", "system"]
+RARE = [f"term{i}" for i in range(5000)]
+QUERIES = {
+    "rare": "term4242",
+    "common": "website",
+    "two words": "online shop",
+    "short prefix": "ter*",
+    "long prefix": "websit*",
+}
+
+
+def fill(rows: int):
+    upgrade(engine)
+    rng = random.Random(1)
+    with engine.begin() as connection:
+        for start in range(0, rows, 10000):
+            connection.execute(insert(ProjectRequest), [
+                {
+                    "name": f"Client {i}",
+                    "email": f"client{i}@example.com",
+                    "project_description": " ".join(rng.choices(COMMON, k=12) + rng.choices(RARE, k=3)),
+                    "status": "pending",
+                }
+                for i in range(start, min(start + 10000, rows))
+            ])
+
+
+async def time_query(backend, q: str, repeat: int, max_ranked: int) -> float:
+    terms = parse_terms(q)
+    async with AsyncReadSessionLocal() as db:
+        await search(db, backend, ProjectRequest, terms, 0, 21, max_ranked=max_ranked)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            await search(db, backend, ProjectRequest, terms, 0, 21, max_ranked=max_ranked)
+    return round((time.perf_counter() - started) / repeat * 1000, 2)
+
+
+async def run(backend, repeat: int):
+    slow_repeat = max(repeat // 10, 1)
+    for label, q in QUERIES.items():
+        print({
+            "query": label,
+            f"{backend.name}_ms": await time_query(backend, q, repeat, SEARCH_MAX_RANKED),
+            f"{backend.name}_always_ranked_ms": await time_query(backend, q, slow_repeat, 0),
+            "like_ms": await time_query(LikeSearch(), q, slow_repeat, SEARCH_MAX_RANKED),
+        })
+    # aiosqlite connections hold threads that would keep the process alive
+    for async_engine_ in (async_engine, read_async_engine):
+        if async_engine_ is not None:
+            await async_engine_.dispose()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    fill(args.rows)
+    print({"rows": args.rows, "fill_seconds": round(time.perf_counter() - started, 1)})
+    with engine.connect() as connection:
+        backend = detect_search_backend(connection)
+    asyncio.run(run(backend, args.repeat))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,143 @@
+"""Requests/sec for the list and detail routes, column tuples + FastJSONResponse
+vs ORM objects validated through the Pydantic response model.
+
+Runs the app in-process against a throwaway SQLite file. The old path is
+registered as extra routes running the same query with ``select(ProjectRequest)``.
+Before timing, every page size is checked for identical JSON on both paths
+(plus a UTC-aware datetime through both encoders), so the numbers compare
+equivalent output.
+
+Usage:
+    python benchmarks/bench_serialization.py --rows 2000 --seconds 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")  # measure the endpoints, not the limiter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from fastapi import Depends, HTTPException  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+import main  # noqa: E402
+import serialization  # noqa: E402
+from database import async_engine, engine, read_async_engine  # noqa: E402
+from migrations import upgrade  # noqa: E402
+from models import ProjectRequest  # noqa: E402
+
+PAGE_SIZES = [10, 100, 500, 1000]
+
+
+@main.app.get("/bench/orm-project-requests", response_model=List[main.ProjectRequestResponse])
+async def orm_list(limit: int = 100, current_user=Depends(main.verify_token), db=Depends(main.get_read_db)):
+    """The previous list path: ORM objects through response_model validation"""
+    query = select(ProjectRequest).order_by(ProjectRequest.created_at.desc(), ProjectRequest.id.desc()).limit(limit)
+    return (await db.execute(query)).scalars().all()
+
+
+@main.app.get("/bench/orm-project-requests/{request_id}", response_model=main.ProjectRequestResponse)
+async def orm_detail(request_id: int, current_user=Depends(main.verify_token), db=Depends(main.get_read_db)):
+    request = await db.get(ProjectRequest, request_id)
+    if not request:
+        raise HTTPException(status_code=404, detail="Project request not found")
+    return request
+
+
+def fill(rows: int):
+    upgrade(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(ProjectRequest), [
+            {
+                "name": f"Client {i}",
+                "email": f"client{i}@example.com",
+                "project_description": "Need a website with a shop and a blog. " * 5 + "Ünïcode ✓",
+                "budget": "$1000-5000" if i % 2 else None,
+                "timeline": "2 months" if i % 3 else None,
+                "project_type": ["web", "mobile", None][i % 3],
+                "status": ["pending", "completed"][i % 2],
+            }
+            for i in range(rows)
+        ])
+
+
+def check_encoders():
+    """Both encoders must render datetimes the way Pydantic does"""
+    sample = {"id": 1, "name": "a", "email": "a@b.co", "project_description": "d", "budget": None,
+              "timeline": None, "project_type": None, "status": "pending"}
+    adapter = TypeAdapter(main.ProjectRequestResponse)
+    for created_at in (datetime(2024, 5, 1, 12, 30, 1, 250), datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)):
+        row = dict(sample, created_at=created_at)
+        expected = json.loads(adapter.dump_json(adapter.validate_python(row)))
+        assert json.loads(serialization.dumps(row)) == expected, ("orjson", row)
+        encoder, serialization.orjson = serialization.orjson, None
+        try:
+            assert json.loads(serialization.dumps(row)) == expected, ("stdlib", row)
+        finally:
+            serialization.orjson = encoder
+
+
+async def rps(client, path: str, headers: dict, seconds: float) -> float:
+    await client.get(path, headers=headers)
+    count, started = 0, time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        response = await client.get(path, headers=headers)
+        assert response.status_code == 200, response.text
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+async def run(rows: int, seconds: float):
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            token = (await client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+
+            for size in PAGE_SIZES:
+                fast = await client.get(f"/api/project-requests?limit={size}", headers=headers)
+                orm = await client.get(f"/bench/orm-project-requests?limit={size}", headers=headers)
+                assert fast.json() == orm.json() and len(fast.json()) == min(size, rows), f"list output differs at limit={size}"
+            first_id = fast.json()[0]["id"]
+            fast = await client.get(f"/api/project-requests/{first_id}", headers=headers)
+            orm = await client.get(f"/bench/orm-project-requests/{first_id}", headers=headers)
+            assert fast.json() == orm.json(), "detail output differs"
+            missing = await client.get("/api/project-requests/999999999", headers=headers)
+            assert missing.status_code == 404
+            print("equivalence: ok")
+
+            for size in PAGE_SIZES:
+                new = await rps(client, f"/api/project-requests?limit={size}", headers, seconds)
+                old = await rps(client, f"/bench/orm-project-requests?limit={size}", headers, seconds)
+                print(f"list limit={size:<5} fast {new:8.1f} req/s   orm+pydantic {old:8.1f} req/s   x{new / old:.2f}")
+            new = await rps(client, f"/api/project-requests/{first_id}", headers, seconds)
+            old = await rps(client, f"/bench/orm-project-requests/{first_id}", headers, seconds)
+            print(f"detail            fast {new:8.1f} req/s   orm+pydantic {old:8.1f} req/s   x{new / old:.2f}")
+    finally:
+        # Pooled aiosqlite connections keep worker threads alive, also when a check fails
+        await async_engine.dispose()
+        await read_async_engine.dispose()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=3.0, help="timing window per route and page size")
+    args = parser.parse_args()
+
+    fill(args.rows)
+    check_encoders()
+    asyncio.run(run(args.rows, args.seconds))
+
+
+if __name__ == "__main__":
+    main_cli()
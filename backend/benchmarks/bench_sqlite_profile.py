@@ -0,0 +1,101 @@
+"""Concurrent read/write throughput of the SQLite profile vs SQLite defaults.
+
+Each profile runs in a fresh subprocess (the engine is configured at import)
+against its own database file. Writer threads insert one request per
+transaction while reader threads run the admin listing query.
+
+Usage:
+    python benchmarks/bench_sqlite_profile.py --writers 4 --readers 8 --seconds 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def worker(args):
+    sys.path.insert(0, BACKEND_DIR)
+    from sqlalchemy import select
+    from database import Base, SessionLocal, engine
+    from models import ProjectRequest
+
+    Base.metadata.create_all(bind=engine)
+    stop = threading.Event()
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def bump(key):
+        with lock:
+            counts[key] += 1
+
+    def write_loop():
+        while not stop.is_set():
+            db = SessionLocal()
+            try:
+                db.add(ProjectRequest(name="Bench", email="bench@example.com", project_description="x" * 200, status="pending"))
+                db.commit()
+                bump("writes")
+            except Exception:
+                bump("errors")
+            finally:
+                db.close()
+
+    def read_loop():
+        query = select(ProjectRequest).order_by(ProjectRequest.created_at.desc(), ProjectRequest.id.desc()).limit(100)
+        while not stop.is_set():
+            db = SessionLocal()
+            try:
+                db.execute(query).scalars().all()
+                bump("reads")
+            except Exception:
+                bump("errors")
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=write_loop) for _ in range(args.writers)]
+    threads += [threading.Thread(target=read_loop) for _ in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(json.dumps({
+        "profile": "tuned" if os.environ["SQLITE_TUNING"] == "1" else "defaults",
+        "writes_per_sec": round(counts["writes"] / args.seconds, 1),
+        "reads_per_sec": round(counts["reads"] / args.seconds, 1),
+        "errors": counts["errors"],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    for tuning in ("0", "1"):
+        env = dict(os.environ, SQLITE_TUNING=tuning, DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+        output = subprocess.run(
+            [sys.executable, __file__, "--worker", "--writers", str(args.writers),
+             "--readers", str(args.readers), "--seconds", str(args.seconds)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        print(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+import logging
 import os
+import time
+
+logger = logging.getLogger("resume.database")
 
 # Load environment variables from .env file (if exists)
 load_dotenv()
@@ -55,17 +62,220 @@ else:
     
     connect_args = {"check_same_thread": False}
 
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+IS_SQLITE_FILE = IS_SQLITE and ":memory:" not in SQLALCHEMY_DATABASE_URL and "mode=memory" not in SQLALCHEMY_DATABASE_URL
+
+# SQLite production profile: WAL lets readers run alongside the single writer.
+# Set SQLITE_TUNING=0 to fall back to SQLite's defaults.
+SQLITE_TUNING = os.getenv("SQLITE_TUNING", "1") == "1"
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB
+    "temp_store": "MEMORY",
+}
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "5"))
+SQLITE_MAX_OVERFLOW = int(os.getenv("SQLITE_MAX_OVERFLOW", "10"))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "10"))
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+def apply_sqlite_read_only(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection, connection_record)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+class PoolStats:
+    """Checkout wait times and timeouts for one connection pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+class TimedPoolMixin:
+    """Records how long each checkout waited for a free connection"""
+
+    def _do_get(self):
+        if not hasattr(self, "stats"):
+            self.stats = PoolStats()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.stats.checkouts += 1
+            self.stats.wait_seconds_total += waited
+            self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, waited)
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+DB_BACKEND = make_url(SQLALCHEMY_DATABASE_URL).get_backend_name()
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "500"))  # SQLAlchemy compiled statement cache
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))  # asyncpg prepared statements
+DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", "2"))  # connections opened at startup
+
+# Pool defaults for networked databases; each can be overridden with DB_POOL_*
+POOL_DEFAULTS = {
+    "mssql": {"pool_size": 10, "max_overflow": 20, "pool_recycle": 1800, "pool_timeout": 30},
+    "postgresql": {"pool_size": 10, "max_overflow": 20, "pool_recycle": 1800, "pool_timeout": 30},
+}
+GENERIC_POOL_DEFAULTS = {"pool_size": 5, "max_overflow": 10, "pool_recycle": 1800, "pool_timeout": 30}
+
+sync_engine_options = {}
+async_engine_options = {}
+async_connect_args = {}
+if IS_SQLITE_FILE and SQLITE_TUNING:
+    # Local files can't drop a connection, so skip the per-checkout ping.
+    # aiosqlite would otherwise default to NullPool and open a connection per session.
+    engine_options = {
+        "pool_pre_ping": False,
+        "pool_size": SQLITE_POOL_SIZE,
+        "max_overflow": SQLITE_MAX_OVERFLOW,
+    }
+    sync_engine_options["poolclass"] = TimedQueuePool
+    async_engine_options["poolclass"] = TimedAsyncAdaptedQueuePool
+elif IS_SQLITE:
+    engine_options = {"pool_pre_ping": True}  # Verify connections before using
+else:
+    pool_defaults = POOL_DEFAULTS.get(DB_BACKEND, GENERIC_POOL_DEFAULTS)
+    engine_options = {
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
+        "pool_size": int(os.getenv("DB_POOL_SIZE", pool_defaults["pool_size"])),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", pool_defaults["max_overflow"])),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", pool_defaults["pool_recycle"])),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", pool_defaults["pool_timeout"])),
+    }
+    sync_engine_options["poolclass"] = TimedQueuePool
+    async_engine_options["poolclass"] = TimedAsyncAdaptedQueuePool
+    if DB_BACKEND == "mssql":
+        # pyodbc sends executemany parameters as one array; aioodbc doesn't expose the flag
+        sync_engine_options["fast_executemany"] = True
+    if DB_BACKEND == "postgresql":
+        async_connect_args["prepared_statement_cache_size"] = DB_STATEMENT_CACHE_SIZE
+engine_options["query_cache_size"] = DB_QUERY_CACHE_SIZE
+
 # Create engine with lazy connection (doesn't connect until first use)
 # Use echo=False to avoid connection attempts during import
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, 
     connect_args=connect_args,
-    pool_pre_ping=True,  # Verify connections before using
     echo=False,  # Don't log SQL queries
-    poolclass=None  # Use default pool
+    **engine_options,
+    **sync_engine_options
 )
+if IS_SQLITE_FILE and SQLITE_TUNING:
+    event.listen(engine, "connect", apply_sqlite_pragmas)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Asyncio drivers used by the request handlers, keyed by backend name
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "mssql": "mssql+aioodbc",
+}
+
+def get_async_database_url(url):
+    """Map a sync database URL onto the matching asyncio driver"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+# Async engine for the API routes so DB round-trips don't block the event loop.
+# The sync engine above is kept for startup tasks. If the async driver is not
+# installed the error is logged and the API reports the database as unavailable
+# instead of failing import.
+# Read-only routes use AsyncReadSessionLocal; on tuned SQLite files that is a
+# separate query_only pool so reads never wait behind the writer's connections.
+try:
+    ASYNC_SQLALCHEMY_DATABASE_URL = make_url(os.getenv("ASYNC_DATABASE_URL")) if os.getenv("ASYNC_DATABASE_URL") \
+        else get_async_database_url(SQLALCHEMY_DATABASE_URL)
+    async_engine = create_async_engine(
+        ASYNC_SQLALCHEMY_DATABASE_URL,
+        connect_args={**connect_args, **async_connect_args},
+        echo=False,
+        **engine_options,
+        **async_engine_options
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    
+    if IS_SQLITE_FILE and SQLITE_TUNING:
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+        read_async_engine = create_async_engine(
+            ASYNC_SQLALCHEMY_DATABASE_URL,
+            connect_args=connect_args,
+            echo=False,
+            poolclass=TimedAsyncAdaptedQueuePool,
+            pool_pre_ping=False,
+            pool_size=SQLITE_READ_POOL_SIZE,
+            max_overflow=0
+        )
+        event.listen(read_async_engine.sync_engine, "connect", apply_sqlite_read_only)
+        AsyncReadSessionLocal = async_sessionmaker(read_async_engine, autoflush=False, expire_on_commit=False)
+    else:
+        read_async_engine = None
+        AsyncReadSessionLocal = AsyncSessionLocal
+except Exception:
+    logger.exception("❌ Could not create the async database engine; API routes will report the database as unavailable")
+    async_engine = None
+    read_async_engine = None
+    AsyncSessionLocal = None
+    AsyncReadSessionLocal = None
+
+async def warm_up_pool(async_engine_to_warm, connections: int = DB_POOL_WARMUP):
+    """Open ``connections`` pooled connections so the first requests don't pay for connect/TLS"""
+    if async_engine_to_warm is None or connections <= 0:
+        return 0
+    pool_capacity = async_engine_to_warm.pool.size() if hasattr(async_engine_to_warm.pool, "size") else connections
+    connections = min(connections, pool_capacity)
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = await async_engine_to_warm.connect()
+            opened.append(connection)
+            await connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in opened:
+            await connection.close()
+    return len(opened)
+
+def pool_status(engine_to_inspect):
+    """Current size, usage and checkout wait figures for an engine's pool"""
+    pool = engine_to_inspect.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    stats = getattr(pool, "stats", None) or PoolStats()
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "capacity": capacity,
+        "saturation": round(pool.checkedout() / capacity, 3) if capacity else 0.0,
+        "checkouts": stats.checkouts,
+        "timeouts": stats.timeouts,
+        "wait_seconds_total": round(stats.wait_seconds_total, 6),
+        "wait_seconds_max": round(stats.wait_seconds_max, 6),
+    }
+
 Base = declarative_base()
 
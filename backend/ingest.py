@@ -0,0 +1,151 @@
+"""Write-behind queue for public project request submissions.
+
+Submissions are validated by the route and put on a bounded in-process
+queue; a background task inserts them in batches (one multi-row INSERT per
+transaction) when either ``batch_size`` rows are waiting or
+``flush_interval`` has passed. A full queue is reported to the caller so the
+route can answer 429 instead of piling up work.
+
+A batch that fails to write is retried with exponential backoff while new
+submissions wait in the queue. If it still fails, its rows are written one
+at a time so a single bad row can't take the rest of the batch with it;
+only rows that fail on their own are dropped (and counted in ``failed``).
+"""
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import insert
+
+logger = logging.getLogger("resume.ingest")
+
+INGEST_MODE = os.getenv("INGEST_MODE", "direct")  # direct | buffered
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "10000"))
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+INGEST_FLUSH_INTERVAL = float(os.getenv("INGEST_FLUSH_INTERVAL", "0.2"))  # seconds
+INGEST_MAX_RETRIES = int(os.getenv("INGEST_MAX_RETRIES", "5"))
+INGEST_RETRY_BACKOFF = float(os.getenv("INGEST_RETRY_BACKOFF", "0.5"))  # seconds, doubles on each retry
+
+
+class IngestQueueFull(Exception):
+    """Raised when the queue can't take another submission"""
+
+
+class IngestQueue:
+    """Bounded queue with a batching background writer"""
+
+    def __init__(self, session_factory, model, max_size: int = INGEST_QUEUE_SIZE,
+                 batch_size: int = INGEST_BATCH_SIZE, flush_interval: float = INGEST_FLUSH_INTERVAL,
+                 max_retries: int = INGEST_MAX_RETRIES, retry_backoff: float = INGEST_RETRY_BACKOFF,
+                 on_flush: Optional[Callable[[List[dict]], None]] = None,
+                 before_commit: Optional[Callable[[object, List[dict]], Awaitable[None]]] = None):
+        self.session_factory = session_factory
+        self.model = model
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.on_flush = on_flush
+        self.before_commit = before_commit  # runs in the batch's transaction, e.g. to update summaries
+        self.flushed = 0
+        self.rejected = 0
+        self.failed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop accepting rows and wait until everything queued is written"""
+        if self._task is None:
+            return
+        self._stopping = True
+        await self._task
+        self._task = None
+
+    def submit(self, row: dict):
+        if self._queue is None or self._stopping:
+            raise IngestQueueFull()
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise IngestQueueFull()
+
+    def qsize(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = []
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+            if batch:
+                await self._flush(batch)
+            elif self._stopping:
+                return
+
+    async def _flush(self, batch: List[dict]):
+        delay = self.retry_backoff
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._write(batch)
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"⚠️ Failed to write {len(batch)} queued submissions after {attempt + 1} attempts: {e}")
+                    if len(batch) == 1:
+                        self.failed += 1
+                        return
+                    # Isolate the rows that can't be written instead of dropping the whole batch
+                    written = []
+                    for row in batch:
+                        try:
+                            await self._write([row])
+                            written.append(row)
+                        except Exception as row_error:
+                            self.failed += 1
+                            logger.error(f"⚠️ Dropped a queued submission: {row_error}")
+                    batch = written
+                    break
+                logger.warning(f"⚠️ Failed to write {len(batch)} queued submissions, retrying in {delay:g}s: {e}")
+                await asyncio.sleep(delay)
+                delay *= 2
+        if not batch:
+            return
+        self.flushed += len(batch)
+        if self.on_flush is not None:
+            self.on_flush(batch)
+
+    async def _write(self, batch: List[dict]):
+        """Insert ``batch`` in one transaction and set each row's ``id``"""
+        for row in batch:
+            row.pop("id", None)  # left over from an attempt that didn't commit
+        async with self.session_factory() as db:
+            result = await db.execute(
+                insert(self.model).returning(self.model.id, sort_by_parameter_order=True), batch
+            )
+            for row, (row_id,) in zip(batch, result.all()):
+                row["id"] = row_id
+            if self.before_commit is not None:
+                await self.before_commit(db, batch)
+            await db.commit()
@@ -1,32 +1,66 @@
 # Resume Backend API - Updated to serve frontend files
-from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect, status
+from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, HTMLResponse
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from typing import List, Optional
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from sqlalchemy import select, update, delete, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Literal, Optional, Set, Tuple
+from collections import OrderedDict
+import asyncio
+import base64
+import csv
+import io
+import time
+import zlib
+import json
 import jwt
 import secrets
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, model_validator
 import os
-import sys
+
+# Logging goes through a queue to a background writer; configure it before anything logs
+from logging_setup import configure_logging
+logger = configure_logging()
 
 # Import database components - these are lazy and won't fail until used
 try:
-    from database import SessionLocal, engine, Base
-    from models import ProjectRequest, User
+    from database import SessionLocal, AsyncSessionLocal, AsyncReadSessionLocal, engine, async_engine, read_async_engine, Base
+    from models import ProjectRequest, ProjectRequestArchive, ProjectRequestEvent, ProjectRequestStat, User, REQUEST_STATUSES
+    from migrations import SCHEMA_VERSION, check_schema
 except Exception as e:
-    print(f"⚠️ Warning: Database import failed: {e}", file=sys.stderr, flush=True)
+    logger.warning(f"⚠️ Warning: Database import failed: {e}")
     # Create dummy objects to allow app to start
     SessionLocal = None
+    AsyncSessionLocal = None
+    AsyncReadSessionLocal = None
     engine = None
+    async_engine = None
+    read_async_engine = None
     Base = None
     ProjectRequest = None
+    ProjectRequestStat = None
+    ProjectRequestEvent = None
+    ProjectRequestArchive = None
     User = None
+    REQUEST_STATUSES = ("pending", "in_progress", "completed", "rejected")
+
+from presence import PresenceBackend, InMemoryPresenceBackend, get_presence_backend
+from static_assets import StaticAssetCache
+from auth_cache import TokenCache
+from passwords import PasswordHasher, PasswordHasherBusy
+from ingest import INGEST_MODE, IngestQueue, IngestQueueFull
+from stats import ProjectStats, StatsDelta, STATS_RECENT_DAYS
+from admin_events import AdminEventHub, request_summary
+from retention import RetentionJob
+from search import LikeSearch, SearchBackend, detect_search_backend, parse_terms, search
+from serialization import FastJSONResponse, rows_to_dicts
+from metrics import MetricsMiddleware, MetricsRegistry, instrument_engine
+from rate_limit import RATE_LIMIT_ENABLED, RateLimit, client_ip, get_rate_limit_store, retry_after_header
 
-# Database tables will be created on startup event
+# Database tables are created by migrations (python migrations.py upgrade), not at startup
 
 app = FastAPI(
     title="Resume Backend API",
@@ -41,58 +75,161 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Next-Skip", "X-Search-Order", "X-Total-Count"],
 )
 
+# Request, database and WebSocket metrics, served at /metrics
+metrics = MetricsRegistry()
+app.add_middleware(MetricsMiddleware, registry=metrics)
+for instrumented_engine in (engine, async_engine, read_async_engine):
+    if instrumented_engine is not None:
+        instrument_engine(metrics, getattr(instrumented_engine, "sync_engine", instrumented_engine))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")  # optional bearer token required to scrape /metrics
+
 # JWT Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 security = HTTPBearer()
+token_cache = TokenCache()
+password_hasher = PasswordHasher()
+
+# WebSocket broadcast tuning
+WS_BROADCAST_INTERVAL = float(os.getenv("WS_BROADCAST_INTERVAL", "0.5"))  # seconds between count pushes
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "2.0"))  # seconds before a client is considered stalled
 
 # WebSocket connections manager
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-    
+    """Tracks online-user sockets and pushes the count at most once per tick.
+
+    Joins and leaves only mark the count as dirty; a single background task
+    coalesces them, publishes the local count to the presence backend,
+    serializes the global total once and fans it out concurrently.
+    Clients that don't accept a send within ``send_timeout`` are dropped.
+    """
+
+    def __init__(self, broadcast_interval: float = WS_BROADCAST_INTERVAL, send_timeout: float = WS_SEND_TIMEOUT,
+                 presence: Optional[PresenceBackend] = None):
+        self.active_connections: Set[WebSocket] = set()
+        self.broadcast_interval = broadcast_interval
+        self.send_timeout = send_timeout
+        self.presence = presence or InMemoryPresenceBackend()
+        self._dirty = asyncio.Event()
+        self._broadcaster: Optional[asyncio.Task] = None
+        self._last_count: Optional[int] = None
+        self._global_count = 0
+        self._published_count = 0
+        self.broadcasts = 0
+        self.dropped = 0
+
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
-        await self.broadcast_count()
-    
+        self.active_connections.add(websocket)
+        # The newcomer gets the current count right away; everyone else on the next tick
+        if not await self._send(websocket, self._payload()):
+            self.active_connections.discard(websocket)
+        self.schedule_broadcast()
+
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        # Broadcast count asynchronously
-        import asyncio
-        asyncio.create_task(self.broadcast_count())
-    
-    async def broadcast_count(self):
-        count = len(self.active_connections)
-        message = {"type": "online_count", "count": count}
-        disconnected = []
-        for connection in self.active_connections:
+        self.active_connections.discard(websocket)
+        self.schedule_broadcast()
+
+    def schedule_broadcast(self):
+        """Mark the count dirty and make sure the broadcaster is running"""
+        self._dirty.set()
+        if self._broadcaster is None or self._broadcaster.done():
+            self._broadcaster = asyncio.create_task(self._broadcast_loop())
+
+    async def stop(self):
+        if self._broadcaster is not None:
+            self._broadcaster.cancel()
             try:
-                await connection.send_json(message)
-            except:
-                disconnected.append(connection)
-        
-        # Remove disconnected connections
-        for conn in disconnected:
-            if conn in self.active_connections:
-                self.active_connections.remove(conn)
+                await self._broadcaster
+            except asyncio.CancelledError:
+                pass
+            self._broadcaster = None
+        await self.presence.close()
+
+    def online_count(self) -> int:
+        """Global count: last known total adjusted by local changes since it was read"""
+        return max(self._global_count - self._published_count + len(self.active_connections), 0)
+
+    async def _sync_presence(self):
+        local_count = len(self.active_connections)
+        try:
+            await self.presence.publish(local_count)
+            self._global_count = await self.presence.total()
+            self._published_count = local_count
+        except Exception as e:
+            logger.warning(f"⚠️ Presence sync failed: {e}")
 
-manager = ConnectionManager()
+    async def _broadcast_loop(self):
+        while True:
+            # Shared backends also resync on a heartbeat to pick up other workers' changes
+            try:
+                await asyncio.wait_for(self._dirty.wait(), timeout=self.presence.sync_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._dirty.clear()
+            await self._sync_presence()
+            if self.online_count() != self._last_count:
+                await self.broadcast_count()
+            await asyncio.sleep(self.broadcast_interval)
+
+    def _payload(self) -> str:
+        return json.dumps({"type": "online_count", "count": self.online_count()})
+
+    async def _send(self, websocket: WebSocket, payload: str) -> bool:
+        try:
+            await asyncio.wait_for(websocket.send_text(payload), timeout=self.send_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def _drop(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(websocket.close(code=status.WS_1011_INTERNAL_ERROR), timeout=self.send_timeout)
+        except Exception:
+            pass
+
+    async def broadcast_count(self):
+        self._last_count = self.online_count()
+        self.broadcasts += 1
+        payload = self._payload()
+        connections = list(self.active_connections)
+        results = await asyncio.gather(*(self._send(connection, payload) for connection in connections))
+
+        # Drop stalled or broken connections instead of letting them hold up the next tick
+        stalled = [connection for connection, ok in zip(connections, results) if not ok]
+        self.dropped += len(stalled)
+        for connection in stalled:
+            self.active_connections.discard(connection)
+            asyncio.create_task(self._drop(connection))
+        if stalled:
+            self._dirty.set()
+
+manager = ConnectionManager(presence=get_presence_backend())
+
+metrics.register("ws_connections", "WebSocket connections held by this worker", "gauge",
+                 lambda: len(manager.active_connections))
+metrics.register("ws_online_users", "Online users across all workers", "gauge", manager.online_count)
+metrics.register("ws_broadcasts_total", "Online-count broadcasts sent", "counter", lambda: manager.broadcasts)
+metrics.register("ws_dropped_total", "WebSocket clients dropped for stalling", "counter", lambda: manager.dropped)
 
 # Database dependency
-def get_db():
-    if SessionLocal is None:
+async def get_db():
+    if AsyncSessionLocal is None:
         raise HTTPException(status_code=503, detail="Database not available")
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Read-only dependency for GET routes (a separate query_only pool on SQLite)
+async def get_read_db():
+    if AsyncReadSessionLocal is None:
+        raise HTTPException(status_code=503, detail="Database not available")
+    async with AsyncReadSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Pydantic models
 class ProjectRequestCreate(BaseModel):
@@ -117,8 +254,140 @@ class ProjectRequestResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# Read routes select exactly these columns and encode the tuples directly
+RESPONSE_FIELDS = tuple(ProjectRequestResponse.model_fields)
+
+def response_columns():
+    return [getattr(ProjectRequest, field) for field in RESPONSE_FIELDS]
+
+class QueuedResponse(BaseModel):
+    status: Literal["queued"]
+
 class ProjectRequestUpdate(BaseModel):
+    status: Optional[Literal[REQUEST_STATUSES]] = None
+
+class ProjectRequestFilter(BaseModel):
     status: Optional[str] = None
+    project_type: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+class BulkProjectRequestAction(BaseModel):
+    action: Literal["update_status", "delete"]
+    ids: Optional[List[int]] = None
+    filter: Optional[ProjectRequestFilter] = None
+    status: Optional[Literal[REQUEST_STATUSES]] = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide either ids or filter")
+        if self.action == "update_status" and self.status is None:
+            raise ValueError("status is required for update_status")
+        return self
+
+class BulkItemResult(BaseModel):
+    id: int
+    result: str
+
+class BulkActionResponse(BaseModel):
+    action: str
+    matched: int
+    results: List[BulkItemResult]
+
+# Listing helpers
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "30"))  # seconds a cached total stays valid
+COUNT_CACHE_SIZE = 256
+
+def encode_cursor(created_at: datetime, request_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{request_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, request_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(request_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def filter_project_requests(
+    query,
+    status: Optional[str] = None,
+    project_type: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+):
+    """Apply the admin listing filters to a select() on ProjectRequest"""
+    if status:
+        query = query.where(ProjectRequest.status == status)
+    if project_type:
+        query = query.where(ProjectRequest.project_type == project_type)
+    if created_from:
+        query = query.where(ProjectRequest.created_at >= created_from)
+    if created_to:
+        query = query.where(ProjectRequest.created_at < created_to)
+    return query
+
+class CountCache:
+    """Bounded TTL cache of listing totals, keyed by filter values"""
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL, max_size: int = COUNT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[tuple, Tuple[float, int]]" = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key: tuple, value: int):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+count_cache = CountCache()
+
+# Optional write-behind queue for public submissions (INGEST_MODE=buffered)
+# Dashboard counts, updated in the same transaction as every write below
+project_stats = ProjectStats(
+    ProjectRequest, ProjectRequestStat, AsyncSessionLocal
+) if AsyncSessionLocal is not None else None
+
+# Full-text search; replaced by the dialect's indexed backend at startup if its index exists
+search_backend: SearchBackend = LikeSearch()
+
+# Change feed for /ws/admin/events, written in the same transactions
+admin_events = AdminEventHub(
+    ProjectRequestEvent, AsyncSessionLocal, send_timeout=WS_SEND_TIMEOUT
+) if AsyncSessionLocal is not None else None
+
+async def record_ingested(db: AsyncSession, rows: List[dict]):
+    delta = StatsDelta()
+    for row in rows:
+        delta.add(row["status"], row.get("project_type"), row["created_at"])
+    await project_stats.apply(db, delta)
+    await admin_events.record(db, "created", requests=[request_summary(row) for row in rows])
+
+def after_ingest_flush(rows: List[dict]):
+    count_cache.clear()
+    admin_events.notify()
+
+ingest_queue = IngestQueue(
+    AsyncSessionLocal, ProjectRequest, on_flush=after_ingest_flush, before_commit=record_ingested
+) if INGEST_MODE == "buffered" and AsyncSessionLocal is not None else None
+
+# Scheduled archival of old finished requests plus table compaction
+retention_job = RetentionJob(
+    ProjectRequest, ProjectRequestArchive, AsyncSessionLocal, async_engine,
+    stats=project_stats, events=admin_events, on_archived=count_cache.clear
+) if AsyncSessionLocal is not None else None
 
 class LoginRequest(BaseModel):
     username: str
@@ -128,6 +397,27 @@ class TokenResponse(BaseModel):
     access_token: str
     token_type: str
 
+# Rate limiting, checked before any database session is opened
+RATE_LIMIT_SUBMIT = RateLimit.parse(os.getenv("RATE_LIMIT_SUBMIT", "5/60"))  # requests/seconds per IP
+RATE_LIMIT_LOGIN = RateLimit.parse(os.getenv("RATE_LIMIT_LOGIN", "10/60"))
+rate_limit_store = get_rate_limit_store()
+rate_limited: Dict[str, int] = {}
+
+def rate_limit(scope: str, limit: RateLimit):
+    """Dependency rejecting a client with 429 once its bucket for ``scope`` is empty"""
+    async def check_rate_limit(request: Request):
+        if not RATE_LIMIT_ENABLED:
+            return
+        allowed, retry_after = await rate_limit_store.hit(f"{scope}:{client_ip(request)}", limit)
+        if not allowed:
+            rate_limited[scope] = rate_limited.get(scope, 0) + 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": retry_after_header(retry_after)}
+            )
+    return check_rate_limit
+
 # Authentication
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -139,8 +429,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    token = credentials.credentials
+async def user_for_token(token: str, db: AsyncSession) -> User:
+    """Resolve a bearer token to its user, raising 401 if it isn't valid"""
+    # Cached entries were fully verified and expire no later than the token itself
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -149,35 +444,39 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security),
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
     
-    user = db.query(User).filter(User.username == username).first()
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
+    db.expunge(user)
+    token_cache.set(token, username, user, payload.get("exp", 0))
     return user
 
-# Initialize admin user if not exists
-def init_admin_user(db: Session):
-    admin = db.query(User).filter(User.username == "admin").first()
-    if not admin:
-        # Default password: admin123 (should be changed in production)
-        import hashlib
-        password_hash = hashlib.sha256("admin123".encode()).hexdigest()
-        admin = User(username="admin", password_hash=password_hash)
-        db.add(admin)
-        db.commit()
-        print("Admin user created: username=admin, password=admin123")
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    # A short read session of its own: a yield dependency would stay open until a streamed
+    # response finishes, and on a cache miss it would take a write-pool connection on GETs
+    if AsyncReadSessionLocal is None:
+        raise HTTPException(status_code=503, detail="Database not available")
+    async with AsyncReadSessionLocal() as db:
+        return await user_for_token(credentials.credentials, db)
 
 # Routes
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup - non-blocking, app will start even if DB fails"""
-    print("🚀 Starting application...", file=sys.stdout, flush=True)
+    global search_backend
+    logger.info("🚀 Starting application...")
     
     # Check if database components are available
     if engine is None or Base is None:
-        print("⚠️ Database not available - app will start in limited mode", file=sys.stderr, flush=True)
-        print("✅ Application started (database disabled)", file=sys.stdout, flush=True)
+        logger.warning("⚠️ Database not available - app will start in limited mode")
+        logger.info("✅ Application started (database disabled)")
         return
     
+    if ingest_queue is not None:
+        ingest_queue.start()
+        logger.info(f"✅ Buffered ingestion enabled (queue size {ingest_queue.max_size})")
+    
     try:
         from database import SQLALCHEMY_DATABASE_URL
         
@@ -193,38 +492,63 @@ async def startup_event():
                         f.write("test")
                     os.remove(test_file)
                 except:
-                    print("⚠️ /tmp is not writable, using current directory", file=sys.stderr, flush=True)
+                    logger.warning("⚠️ /tmp is not writable, using current directory")
             except Exception as e:
-                print(f"⚠️ Could not create /tmp: {e}", file=sys.stderr, flush=True)
+                logger.warning(f"⚠️ Could not create /tmp: {e}")
         
-        # Ensure database tables exist (non-blocking)
-        try:
-            Base.metadata.create_all(bind=engine)
-            print("✅ Database tables created/verified", file=sys.stdout, flush=True)
-        except Exception as db_error:
-            print(f"⚠️ Database initialization error: {db_error}", file=sys.stderr, flush=True)
-            import traceback
-            traceback.print_exc(file=sys.stderr)
-            # Continue anyway - app can still start
+        # Schema changes run out-of-band (python migrations.py upgrade); startup only checks the version
+        async with async_engine.connect() as connection:
+            schema_version = await connection.run_sync(check_schema)
+            # Text index for /api/project-requests/search (FTS5, tsvector or SQL Server full-text)
+            search_backend = await connection.run_sync(detect_search_backend)
+        logger.info(f"✅ Database schema version {schema_version}, search backend: {search_backend.name}")
         
-        # Initialize admin user (non-blocking)
-        try:
-            db = SessionLocal()
+        # Rebuild the dashboard counts from the table, then keep reconciling them periodically
+        if schema_version >= SCHEMA_VERSION:
             try:
-                init_admin_user(db)
-            finally:
-                db.close()
-        except Exception as user_error:
-            print(f"⚠️ Admin user initialization error: {user_error}", file=sys.stderr, flush=True)
+                await project_stats.reconcile()
+                project_stats.start()
+                logger.info("✅ Request stats reconciled")
+            except Exception as stats_error:
+                logger.warning(f"⚠️ Request stats reconciliation failed: {stats_error}")
+            admin_events.start()
+            retention_job.start()
+        
+        # Pre-open pooled connections so the first requests after a deploy don't pay for connect/TLS
+        try:
+            from database import warm_up_pool
+            warmed = await warm_up_pool(async_engine)
+            if read_async_engine is not None:
+                warmed += await warm_up_pool(read_async_engine)
+            logger.info(f"✅ Warmed up {warmed} database connections")
+        except Exception as warmup_error:
+            logger.warning(f"⚠️ Connection pool warm-up failed: {warmup_error}")
         
         db_type = "MSSQL" if "mssql" in SQLALCHEMY_DATABASE_URL.lower() else "SQLite"
-        print(f"✅ Application started successfully with {db_type} database", file=sys.stdout, flush=True)
+        logger.info(f"✅ Application started successfully with {db_type} database")
     except Exception as e:
-        print(f"⚠️ Startup warning: {e}", file=sys.stderr, flush=True)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        logger.warning(f"⚠️ Startup warning: {e}", exc_info=True)
         # Don't fail the app, just log the error
-        print("✅ Application started (with database warnings)", file=sys.stdout, flush=True)
+        logger.info("✅ Application started (with database warnings)")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks so the worker exits cleanly"""
+    if ingest_queue is not None:
+        # Write out everything already accepted before the engine goes away
+        await ingest_queue.stop()
+    if project_stats is not None:
+        await project_stats.stop()
+    if admin_events is not None:
+        await admin_events.stop()
+    if retention_job is not None:
+        await retention_job.stop()
+    await manager.stop()
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+    if read_async_engine is not None:
+        await read_async_engine.dispose()
 
 # API status endpoint (for API clients)
 @app.get("/api/status")
@@ -237,6 +561,8 @@ async def api_status():
     }
 
 # Mount static files directory for CSS, JS, and other assets
+STATIC_ASSET_FILES = ["index.html", "portfolio.html", "admin.html", "styles.css", "portfolio.css"]
+
 def get_static_dir():
     """Get the static directory path, checking multiple locations"""
     base_dir = os.path.dirname(__file__)
@@ -252,51 +578,50 @@ def get_static_dir():
     return os.path.join(base_dir, "static")
 
 static_dir = get_static_dir()
-print(f"Static directory: {static_dir}, exists: {os.path.exists(static_dir)}", file=sys.stderr, flush=True)
+logger.debug(f"Static directory: {static_dir}, exists: {os.path.exists(static_dir)}")
+
+# Frontend files are read once here and served from memory with ETags and precompressed variants
+static_assets = StaticAssetCache()
+static_assets.load(static_dir, STATIC_ASSET_FILES)
+
 if os.path.exists(static_dir):
     try:
         app.mount("/static", StaticFiles(directory=static_dir), name="static")
-        print(f"Mounted static files from: {static_dir}", file=sys.stderr, flush=True)
+        logger.debug(f"Mounted static files from: {static_dir}")
     except Exception as e:
-        print(f"Error mounting static files: {e}", file=sys.stderr, flush=True)
+        logger.warning(f"Error mounting static files: {e}")
     
     # Also serve CSS files at root level for compatibility
     @app.get("/styles.css")
-    async def serve_styles():
+    async def serve_styles(request: Request):
         """Serve the main stylesheet"""
-        styles_path = os.path.join(static_dir, "styles.css")
-        if os.path.exists(styles_path):
-            return FileResponse(styles_path, media_type="text/css")
+        asset = static_assets.get("styles.css")
+        if asset:
+            return asset.response(request)
         raise HTTPException(status_code=404, detail="Stylesheet not found")
     
     @app.get("/portfolio.css")
-    async def serve_portfolio_css():
+    async def serve_portfolio_css(request: Request):
         """Serve the portfolio stylesheet"""
-        css_path = os.path.join(static_dir, "portfolio.css")
-        if os.path.exists(css_path):
-            return FileResponse(css_path, media_type="text/css")
+        asset = static_assets.get("portfolio.css")
+        if asset:
+            return asset.response(request)
         raise HTTPException(status_code=404, detail="Portfolio stylesheet not found")
 else:
-    print(f"WARNING: Static directory not found at {static_dir}", file=sys.stderr, flush=True)
+    logger.warning(f"Static directory not found at {static_dir}")
 
 # Serve frontend HTML files from static directory
 # Frontend HTML serving is ACTIVE - serves index.html, portfolio.html, admin.html
 @app.get("/", response_class=HTMLResponse)
-async def serve_index():
+async def serve_index(request: Request):
     """Serve the main index.html page - Frontend serving is ACTIVE"""
-    static_dir = get_static_dir()
-    index_path = os.path.join(static_dir, "index.html")
-    
-    # Debug logging
-    print(f"Looking for index.html at: {index_path}", file=sys.stderr, flush=True)
-    print(f"Static dir exists: {os.path.exists(static_dir)}", file=sys.stderr, flush=True)
-    if os.path.exists(static_dir):
-        print(f"Files in static dir: {os.listdir(static_dir)}", file=sys.stderr, flush=True)
-    
-    if os.path.exists(index_path):
-        return FileResponse(index_path)
+    logger.debug("Serving index.html", extra={"path": request.url.path})
+    asset = static_assets.get("index.html")
+    if asset:
+        return asset.response(request)
     
     # Fallback message with debug info
+    index_path = os.path.join(static_dir, "index.html")
     return HTMLResponse(f"""
     <html>
     <head><title>Resume API</title></head>
@@ -313,55 +638,122 @@ async def serve_index():
     """)
 
 @app.get("/index.html", response_class=HTMLResponse)
-async def serve_index_html():
+async def serve_index_html(request: Request):
     """Serve index.html at /index.html route for navigation compatibility"""
-    return await serve_index()
+    return await serve_index(request)
 
 @app.get("/portfolio.html", response_class=HTMLResponse)
-async def serve_portfolio():
+async def serve_portfolio(request: Request):
     """Serve the portfolio page"""
-    static_dir = get_static_dir()
-    portfolio_path = os.path.join(static_dir, "portfolio.html")
-    print(f"Looking for portfolio.html at: {portfolio_path}", file=sys.stderr, flush=True)
-    if os.path.exists(portfolio_path):
-        return FileResponse(portfolio_path)
-    raise HTTPException(status_code=404, detail=f"Portfolio page not found at {portfolio_path}")
+    logger.debug("Serving portfolio.html", extra={"path": request.url.path})
+    asset = static_assets.get("portfolio.html")
+    if asset:
+        return asset.response(request)
+    raise HTTPException(status_code=404, detail=f"Portfolio page not found in {static_dir}")
 
 @app.get("/admin.html", response_class=HTMLResponse)
-async def serve_admin():
+async def serve_admin(request: Request):
     """Serve the admin page"""
-    static_dir = get_static_dir()
-    admin_path = os.path.join(static_dir, "admin.html")
-    print(f"Looking for admin.html at: {admin_path}", file=sys.stderr, flush=True)
-    if os.path.exists(admin_path):
-        return FileResponse(admin_path)
-    raise HTTPException(status_code=404, detail=f"Admin page not found at {admin_path}")
+    logger.debug("Serving admin.html", extra={"path": request.url.path})
+    asset = static_assets.get("admin.html")
+    if asset:
+        return asset.response(request)
+    raise HTTPException(status_code=404, detail=f"Admin page not found in {static_dir}")
 
 # Additional routes for navigation compatibility (without .html extension)
 @app.get("/portfolio", response_class=HTMLResponse)
-async def serve_portfolio_short():
+async def serve_portfolio_short(request: Request):
     """Serve portfolio at /portfolio route"""
-    return await serve_portfolio()
+    return await serve_portfolio(request)
 
 @app.get("/admin", response_class=HTMLResponse)
-async def serve_admin_short():
+async def serve_admin_short(request: Request):
     """Serve admin at /admin route"""
-    return await serve_admin()
+    return await serve_admin(request)
+
+def _pool_metric(field):
+    from database import pool_status
+    engines = {"sync": engine, "async": async_engine, "async_read": read_async_engine}
+    values = {}
+    for name, pooled_engine in engines.items():
+        pool = pool_status(pooled_engine) if pooled_engine is not None else None
+        if pool is not None:
+            values[name] = pool[field]
+    return values
+
+metrics.register("db_pool_checked_out", "Connections checked out", "gauge", lambda: _pool_metric("checked_out"), "engine")
+metrics.register("db_pool_saturation", "Checked-out share of pool capacity", "gauge", lambda: _pool_metric("saturation"), "engine")
+metrics.register("db_pool_wait_seconds_total", "Time spent waiting for a connection", "counter",
+                 lambda: _pool_metric("wait_seconds_total"), "engine")
+metrics.register("db_pool_timeouts_total", "Checkouts that timed out", "counter", lambda: _pool_metric("timeouts"), "engine")
+metrics.register("token_cache_hits_total", "Verified-token cache hits", "counter", lambda: token_cache.hits)
+metrics.register("token_cache_misses_total", "Verified-token cache misses", "counter", lambda: token_cache.misses)
+metrics.register("rate_limited_total", "Requests rejected by the rate limiter", "counter",
+                 lambda: dict(rate_limited), "scope")
+metrics.register("admin_ws_connections", "Admin event sockets held by this worker", "gauge",
+                 lambda: len(admin_events.clients) if admin_events is not None else None)
+metrics.register("admin_events_delivered_total", "Admin events fanned out", "counter",
+                 lambda: admin_events.delivered if admin_events is not None else None)
+metrics.register("admin_ws_overflows_total", "Admin sockets disconnected for falling behind", "counter",
+                 lambda: admin_events.overflows if admin_events is not None else None)
+metrics.register("retention_rows_archived_total", "Finished requests moved to the archive", "counter",
+                 lambda: retention_job.rows_archived if retention_job is not None else None)
+metrics.register("retention_bytes_reclaimed", "Net size decrease from archiving and compaction, summed over runs "
+                 "(on SQLite the whole file including the archive; negative if it grew)", "gauge",
+                 lambda: retention_job.bytes_reclaimed if retention_job is not None else None)
+metrics.register("ingest_queue_depth", "Submissions waiting to be written", "gauge",
+                 lambda: ingest_queue.qsize() if ingest_queue is not None else None)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(request: Request):
+    """Prometheus text exposition of this worker's metrics"""
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/db/pool-stats")
+async def db_pool_stats(current_user: User = Depends(verify_token)):
+    """Connection pool usage and checkout wait times per engine"""
+    from database import pool_status
+    engines = {"sync": engine, "async": async_engine, "async_read": read_async_engine}
+    return {name: pool_status(e) for name, e in engines.items() if e is not None}
+
+@app.get("/api/maintenance/retention")
+async def retention_report(current_user: User = Depends(verify_token)):
+    """Settings and the report of the last archival run in this worker"""
+    return {
+        "days": retention_job.days,
+        "statuses": list(retention_job.statuses),
+        "interval_seconds": retention_job.interval,
+        "last_run": retention_job.last_report,
+    }
+
+@app.post("/api/maintenance/retention")
+async def run_retention(current_user: User = Depends(verify_token)):
+    """Archive due requests now (bounded like a scheduled run) and report rows and bytes reclaimed"""
+    return await retention_job.run_once()
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "resume-api"}
 
-@app.post("/api/auth/login", response_model=TokenResponse)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
-    import hashlib
-    password_hash = hashlib.sha256(login_data.password.encode()).hexdigest()
-    user = db.query(User).filter(
-        User.username == login_data.username,
-        User.password_hash == password_hash
-    ).first()
+@app.post("/api/auth/login", response_model=TokenResponse, dependencies=[Depends(rate_limit("login", RATE_LIMIT_LOGIN))])
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(User).where(User.username == login_data.username))
+    user = result.scalars().first()
     
-    if not user:
+    try:
+        matches, needs_rehash = await password_hasher.verify(
+            login_data.password, user.password_hash if user else None
+        )
+        if matches and needs_rehash:
+            # Upgrade legacy sha256 or outdated-cost hashes transparently
+            user.password_hash = await password_hasher.hash(login_data.password)
+            await db.commit()
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=503, detail="Too many login attempts in progress", headers={"Retry-After": "1"})
+    
+    if not matches:
         raise HTTPException(status_code=401, detail="Incorrect username or password")
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -372,27 +764,43 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
 
 # Debug endpoint to reset admin password (remove in production!)
 @app.post("/api/auth/reset-admin")
-async def reset_admin_password(db: Session = Depends(get_db)):
+async def reset_admin_password(db: AsyncSession = Depends(get_db)):
     """Reset admin password to default (admin123) - FOR DEBUGGING ONLY"""
-    import hashlib
-    admin = db.query(User).filter(User.username == "admin").first()
+    result = await db.execute(select(User).where(User.username == "admin"))
+    admin = result.scalars().first()
+    try:
+        password_hash = await password_hasher.hash("admin123")
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=503, detail="Password hashing busy", headers={"Retry-After": "1"})
     
     if not admin:
         # Create admin if doesn't exist
-        password_hash = hashlib.sha256("admin123".encode()).hexdigest()
         admin = User(username="admin", password_hash=password_hash)
         db.add(admin)
-        db.commit()
+        await db.commit()
         return {"message": "Admin user created", "username": "admin", "password": "admin123"}
     else:
         # Reset password
-        password_hash = hashlib.sha256("admin123".encode()).hexdigest()
         admin.password_hash = password_hash
-        db.commit()
+        await db.commit()
+        token_cache.invalidate_subject("admin")
         return {"message": "Admin password reset", "username": "admin", "password": "admin123"}
 
-@app.post("/api/project-requests", response_model=ProjectRequestResponse)
-async def create_project_request(request: ProjectRequestCreate, db: Session = Depends(get_db)):
+@app.post("/api/project-requests", response_model=ProjectRequestResponse,
+          responses={202: {"model": QueuedResponse, "description": "Accepted for a batched write (INGEST_MODE=buffered)"}},
+          dependencies=[Depends(rate_limit("submit", RATE_LIMIT_SUBMIT))])
+async def create_project_request(request: ProjectRequestCreate, db: AsyncSession = Depends(get_db)):
+    if ingest_queue is not None:
+        try:
+            ingest_queue.submit({
+                **request.model_dump(),
+                "status": "pending",
+                "created_at": datetime.now(timezone.utc)
+            })
+        except IngestQueueFull:
+            raise HTTPException(status_code=429, detail="Too many submissions, please try again shortly", headers={"Retry-After": "1"})
+        return JSONResponse(status_code=202, content={"status": "queued"})
+    
     db_request = ProjectRequest(
         name=request.name,
         email=request.email,
@@ -403,60 +811,275 @@ async def create_project_request(request: ProjectRequestCreate, db: Session = De
         status="pending"
     )
     db.add(db_request)
-    db.commit()
-    db.refresh(db_request)
+    await db.flush()
+    await db.refresh(db_request)
+    await project_stats.apply(db, StatsDelta().add("pending", request.project_type, db_request.created_at))
+    await admin_events.record(db, "created", requests=[request_summary(db_request)])
+    await db.commit()
+    count_cache.clear()
+    admin_events.notify()
     return db_request
 
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+@app.post("/api/project-requests/bulk", response_model=BulkActionResponse)
+async def bulk_project_requests(
+    bulk: BulkProjectRequestAction,
+    current_user: User = Depends(verify_token),
+    db: AsyncSession = Depends(get_db)
+):
+    """Update the status of, or delete, many requests in one transaction"""
+    columns = select(ProjectRequest.id, ProjectRequest.status, ProjectRequest.project_type, ProjectRequest.created_at)
+    if bulk.ids is not None:
+        ids = list(dict.fromkeys(bulk.ids))
+        if len(ids) > BULK_MAX_ITEMS:
+            raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ITEMS} ids per call")
+        query = columns.where(ProjectRequest.id.in_(ids))
+    else:
+        f = bulk.filter
+        query = filter_project_requests(
+            columns, f.status, f.project_type, f.created_from, f.created_to
+        ).order_by(ProjectRequest.id).limit(BULK_MAX_ITEMS + 1)
+    matched = (await db.execute(query)).all()
+    found = {row.id for row in matched}
+    if bulk.ids is None:
+        if len(found) > BULK_MAX_ITEMS:
+            raise HTTPException(status_code=400, detail=f"Filter matches more than {BULK_MAX_ITEMS} requests")
+        ids = sorted(found)
+
+    if found:
+        delta = StatsDelta()
+        if bulk.action == "delete":
+            statement = delete(ProjectRequest).where(ProjectRequest.id.in_(found))
+            for row in matched:
+                delta.remove(row.status, row.project_type, row.created_at)
+            await admin_events.record(db, "deleted", request_ids=sorted(found))
+        else:
+            statement = update(ProjectRequest).where(ProjectRequest.id.in_(found)).values(status=bulk.status)
+            for row in matched:
+                delta.change_status(row.status, bulk.status)
+            await admin_events.record(db, "status_changed", request_ids=sorted(found), status=bulk.status)
+        await db.execute(statement.execution_options(synchronize_session=False))
+        await project_stats.apply(db, delta)
+        await db.commit()
+        count_cache.clear()
+        admin_events.notify()
+
+    done = "deleted" if bulk.action == "delete" else "updated"
+    return {
+        "action": bulk.action,
+        "matched": len(found),
+        "results": [{"id": i, "result": done if i in found else "not_found"} for i in ids],
+    }
+
 @app.get("/api/project-requests", response_model=List[ProjectRequestResponse])
 async def get_project_requests(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    project_type: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    include_total: bool = False,
+    current_user: User = Depends(verify_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """List requests newest first.
+
+    Pass the ``X-Next-Cursor`` header from the previous page as ``cursor`` to
+    continue; ``skip`` is kept for older clients and ignored with a cursor.
+    Rows are selected as plain tuples and encoded without building ORM
+    objects or validating each row against the response model.
+    """
+    filters = (status, project_type, created_from, created_to)
+    query = filter_project_requests(select(*response_columns()), *filters)
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(or_(
+            ProjectRequest.created_at < cursor_created_at,
+            and_(ProjectRequest.created_at == cursor_created_at, ProjectRequest.id < cursor_id)
+        ))
+    elif skip:
+        query = query.offset(skip)
+    query = query.order_by(ProjectRequest.created_at.desc(), ProjectRequest.id.desc()).limit(limit)
+    rows = (await db.execute(query)).all()
+
+    headers = {}
+    if len(rows) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    if include_total:
+        total = count_cache.get(filters)
+        if total is None:
+            count_query = filter_project_requests(select(func.count()).select_from(ProjectRequest), *filters)
+            total = (await db.execute(count_query)).scalar_one()
+            count_cache.set(filters, total)
+        headers["X-Total-Count"] = str(total)
+    return FastJSONResponse(rows_to_dicts(RESPONSE_FIELDS, rows), headers=headers)
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+EXPORT_COLUMNS = ["id", "name", "email", "project_description", "budget", "timeline", "project_type", "status", "created_at"]
+
+async def iter_export_rows(filters: tuple, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Yield lists of row dicts, fetched in id-keyset chunks.
+
+    Each chunk runs on its own short session, which is closed before the chunk
+    is yielded. Sessions autobegin a transaction (a real one on PostgreSQL and
+    MSSQL), so this way no transaction, snapshot or pooled connection is held
+    while the client downloads, and memory stays bounded by ``chunk_size``.
+    """
+    columns = [getattr(ProjectRequest, name) for name in EXPORT_COLUMNS]
+    last_id = 0
+    while True:
+        query = filter_project_requests(select(*columns), *filters)
+        query = query.where(ProjectRequest.id > last_id).order_by(ProjectRequest.id).limit(chunk_size)
+        async with AsyncReadSessionLocal() as db:
+            rows = [dict(row) for row in (await db.execute(query)).mappings().all()]
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        yield rows
+
+def format_export_chunk(rows: List[dict], export_format: str) -> str:
+    for row in rows:
+        if row["created_at"] is not None:
+            row["created_at"] = row["created_at"].isoformat()
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS).writerows(rows)
+        return buffer.getvalue()
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+@app.get("/api/project-requests/search", response_model=List[ProjectRequestResponse])
+async def search_project_requests(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0, le=10000),
+    limit: int = Query(20, ge=1, le=100),
+    prefix: bool = False,
+    status: Optional[str] = None,
+    project_type: Optional[str] = None,
+    current_user: User = Depends(verify_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Best matches first across name, email and description.
+
+    ``word*`` matches words starting with ``word``; with ``prefix=true`` the
+    last word does too, for search-as-you-type. Very broad
+    queries are sorted newest first instead (``X-Search-Order: recent``).
+    When more results exist, ``X-Next-Skip`` holds the ``skip`` for the
+    next page.
+    """
+    terms = parse_terms(q, prefix)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query has no searchable words")
+    restrict = None
+    if status or project_type:
+        restrict = filter_project_requests(select(ProjectRequest.id), status, project_type, None, None)
+    results, order = await search(db, search_backend, ProjectRequest, terms, skip, limit + 1, restrict)
+    response.headers["X-Search-Order"] = order
+    if len(results) > limit:
+        response.headers["X-Next-Skip"] = str(skip + limit)
+    return results[:limit]
+
+@app.get("/api/project-requests/stats")
+async def project_request_stats(
+    recent_days: int = Query(STATS_RECENT_DAYS, ge=1, le=366),
     current_user: User = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Counts by status and project type plus daily volume, read from the summary table"""
+    return await project_stats.read(db, recent_days)
+
+@app.get("/api/project-requests/export")
+async def export_project_requests(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    compress: bool = False,
+    status: Optional[str] = None,
+    project_type: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    current_user: User = Depends(verify_token)
 ):
-    requests = db.query(ProjectRequest).offset(skip).limit(limit).all()
-    return requests
+    """Stream matching requests as NDJSON or CSV, optionally gzip-compressed"""
+    filters = (status, project_type, created_from, created_to)
+
+    async def generate():
+        compressor = zlib.compressobj(wbits=31) if compress else None
+
+        def encode(text: str) -> bytes:
+            data = text.encode()
+            return compressor.compress(data) if compressor else data
+
+        if format == "csv":
+            yield encode(",".join(EXPORT_COLUMNS) + "\r\n")
+        async for rows in iter_export_rows(filters):
+            data = encode(format_export_chunk(rows, format))
+            if data:
+                yield data
+        if compressor:
+            yield compressor.flush()
+
+    filename = f"project_requests.{'csv' if format == 'csv' else 'ndjson'}"
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @app.get("/api/project-requests/{request_id}", response_model=ProjectRequestResponse)
 async def get_project_request(
     request_id: int,
     current_user: User = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    request = db.query(ProjectRequest).filter(ProjectRequest.id == request_id).first()
-    if not request:
+    query = select(*response_columns()).where(ProjectRequest.id == request_id)
+    row = (await db.execute(query)).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Project request not found")
-    return request
+    return FastJSONResponse(dict(zip(RESPONSE_FIELDS, row)))
 
 @app.patch("/api/project-requests/{request_id}", response_model=ProjectRequestResponse)
 async def update_project_request(
     request_id: int,
     request_update: ProjectRequestUpdate,
     current_user: User = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    db_request = db.query(ProjectRequest).filter(ProjectRequest.id == request_id).first()
+    db_request = await db.get(ProjectRequest, request_id)
     if not db_request:
         raise HTTPException(status_code=404, detail="Project request not found")
     
-    if request_update.status:
+    if request_update.status and request_update.status != db_request.status:
+        await project_stats.apply(db, StatsDelta().change_status(db_request.status, request_update.status))
+        await admin_events.record(db, "status_changed", request_ids=[request_id], status=request_update.status)
         db_request.status = request_update.status
-    db.commit()
-    db.refresh(db_request)
+    # Sessions don't expire on commit, so the instance is already up to date
+    await db.commit()
+    count_cache.clear()
+    admin_events.notify()
     return db_request
 
 @app.delete("/api/project-requests/{request_id}")
 async def delete_project_request(
     request_id: int,
     current_user: User = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    db_request = db.query(ProjectRequest).filter(ProjectRequest.id == request_id).first()
+    db_request = await db.get(ProjectRequest, request_id)
     if not db_request:
         raise HTTPException(status_code=404, detail="Project request not found")
     
-    db.delete(db_request)
-    db.commit()
+    await db.delete(db_request)
+    await project_stats.apply(db, StatsDelta().remove(db_request.status, db_request.project_type, db_request.created_at))
+    await admin_events.record(db, "deleted", request_ids=[request_id])
+    await db.commit()
+    count_cache.clear()
+    admin_events.notify()
     return {"message": "Project request deleted successfully"}
 
 @app.websocket("/ws/online-users")
@@ -467,8 +1090,39 @@ async def websocket_endpoint(websocket: WebSocket):
             # Keep connection alive
             await websocket.receive_text()
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
+ADMIN_WS_AUTH_TIMEOUT = float(os.getenv("ADMIN_WS_AUTH_TIMEOUT", "5"))  # seconds to send the token
+
+@app.websocket("/ws/admin/events")
+async def admin_events_websocket(websocket: WebSocket):
+    """Live request changes for the admin panel.
+
+    The first message must be ``{"token": "<jwt>", "last_event_id": <id or null>}``
+    (browsers can't set headers on WebSockets). Events after ``last_event_id``
+    are replayed, then ``{"type": "ready"}`` is sent and live events follow.
+    ``{"type": "reset"}`` means the id is too old and the list must be reloaded.
+    """
+    await websocket.accept()
+    if admin_events is None:
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+    try:
+        hello = json.loads(await asyncio.wait_for(websocket.receive_text(), timeout=ADMIN_WS_AUTH_TIMEOUT))
+        async with AsyncSessionLocal() as db:
+            await user_for_token(str(hello.get("token") or ""), db)
+        last_event_id = hello.get("last_event_id")
+        if last_event_id is not None:
+            last_event_id = int(last_event_id)
+    except WebSocketDisconnect:
+        return
+    except (asyncio.TimeoutError, HTTPException, ValueError, TypeError, AttributeError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await admin_events.serve(websocket, last_event_id)
+
 # Note: For production deployment on Liara, use: uvicorn main:app --host 0.0.0.0 --port 80
 # This block is used when Liara runs python3 main.py (fallback)
 if __name__ == "__main__":
@@ -0,0 +1,219 @@
+"""Request, database and WebSocket metrics in Prometheus text format.
+
+``MetricsMiddleware`` times every HTTP request by route template and status,
+and ``instrument_engine`` counts and times the SQL statements each request
+runs (tracked through a context variable, so it works for the async engines
+too). Other components register callbacks that are read at scrape time.
+"""
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+logger = logging.getLogger("resume.metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "0"))  # 0 disables the slow-request log
+
+
+class RequestStats:
+    """Per-request counters filled in by the SQLAlchemy hooks"""
+
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.series: Dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float):
+        series = self.series.get(labels)
+        if series is None:
+            # bucket counts, then +Inf count, then sum
+            series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += 1
+        series[-1] += value
+
+
+def _format_labels(names: Tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{str(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class MetricsRegistry:
+    """Holds request/DB metrics and scrape-time callbacks"""
+
+    def __init__(self):
+        self.requests_total: Dict[tuple, int] = {}
+        self.request_latency = Histogram(LATENCY_BUCKETS)
+        self.requests_in_flight = 0
+        self.db_queries_total: Dict[tuple, int] = {}
+        self.db_query_latency = Histogram(QUERY_BUCKETS)
+        self.request_queries = Histogram((0, 1, 2, 3, 5, 10, 25, 50))
+        self._callbacks = []
+
+    def register(self, name: str, help_text: str, metric_type: str, callback: Callable, label: str = ""):
+        """Expose a value read at scrape time.
+
+        ``callback`` returns a number, or a dict of label value -> number when
+        ``label`` is given. Returning None skips the metric.
+        """
+        self._callbacks.append((name, help_text, metric_type, callback, label))
+
+    def observe_request(self, method: str, route: str, status_code: int, seconds: float, stats: RequestStats):
+        key = (method, route, status_code)
+        self.requests_total[key] = self.requests_total.get(key, 0) + 1
+        self.request_latency.observe((method, route), seconds)
+        self.request_queries.observe((method, route), stats.queries)
+        if stats.queries:
+            db_key = (method, route)
+            self.db_queries_total[db_key] = self.db_queries_total.get(db_key, 0) + stats.queries
+
+    def render(self) -> str:
+        lines = []
+
+        def header(name, help_text, metric_type):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        def histogram(name, help_text, histogram_, label_names):
+            header(name, help_text, "histogram")
+            for labels, series in sorted(histogram_.series.items()):
+                for bound, count in zip(histogram_.buckets, series):
+                    bucket_labels = _format_labels(label_names, labels, 'le="%s"' % bound)
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                bucket_labels = _format_labels(label_names, labels, 'le="+Inf"')
+                lines.append(f"{name}_bucket{bucket_labels} {series[-2]}")
+                lines.append(f"{name}_count{_format_labels(label_names, labels)} {series[-2]}")
+                lines.append(f"{name}_sum{_format_labels(label_names, labels)} {series[-1]:.6f}")
+
+        header("http_requests_total", "HTTP requests by route and status", "counter")
+        for (method, route, status_code), count in sorted(self.requests_total.items()):
+            lines.append(f"http_requests_total{_format_labels(('method', 'route', 'status'), (method, route, status_code))} {count}")
+        histogram("http_request_duration_seconds", "HTTP request latency", self.request_latency, ("method", "route"))
+        header("http_requests_in_flight", "HTTP requests currently being served", "gauge")
+        lines.append(f"http_requests_in_flight {self.requests_in_flight}")
+
+        header("db_queries_total", "SQL statements executed, by route", "counter")
+        for (method, route), count in sorted(self.db_queries_total.items()):
+            lines.append(f"db_queries_total{_format_labels(('method', 'route'), (method, route))} {count}")
+        histogram("db_query_duration_seconds", "SQL statement latency", self.db_query_latency, ())
+        histogram("http_request_db_queries", "SQL statements per request", self.request_queries, ("method", "route"))
+
+        for name, help_text, metric_type, callback, label in self._callbacks:
+            try:
+                value = callback()
+            except Exception:
+                continue
+            if value is None:
+                continue
+            header(name, help_text, metric_type)
+            if label:
+                for label_value, number in sorted(value.items()):
+                    lines.append(f"{name}{_format_labels((label,), (label_value,))} {number}")
+            else:
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def instrument_engine(registry: MetricsRegistry, sync_engine):
+    """Count and time statements on ``sync_engine`` (use ``.sync_engine`` for async engines)"""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        registry.db_query_latency.observe((), elapsed)
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        starts = context.connection.info.get("query_start_time") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and query counts per route"""
+
+    def __init__(self, app, registry: MetricsRegistry, slow_request_seconds: float = SLOW_REQUEST_SECONDS):
+        self.app = app
+        self.registry = registry
+        self.slow_request_seconds = slow_request_seconds
+        self._route_paths: Dict[object, str] = {}
+
+    def _route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            # Routes are known once the app is built; refresh lazily if new ones appear
+            for route in scope["app"].routes:
+                target = getattr(route, "endpoint", None) or getattr(route, "app", None)
+                self._route_paths[target] = route.path
+            path = self._route_paths.get(endpoint, "unmatched")
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.registry.requests_in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.registry.requests_in_flight -= 1
+            current_request.reset(token)
+            route = self._route_label(scope)
+            self.registry.observe_request(scope["method"], route, status_code, elapsed, stats)
+            if self.slow_request_seconds and elapsed >= self.slow_request_seconds:
+                logger.warning(
+                    f"🐢 Slow request: {scope['method']} {scope['path']} -> {status_code} in {elapsed * 1000:.1f}ms, "
+                    f"{stats.queries} queries ({stats.query_seconds * 1000:.1f}ms)",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": route,
+                        "status": status_code,
+                        "duration_ms": round(elapsed * 1000, 1),
+                        "queries": stats.queries,
+                        "query_ms": round(stats.query_seconds * 1000, 1),
+                    }
+                )
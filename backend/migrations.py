@@ -0,0 +1,284 @@
+"""Versioned schema migrations, run out-of-band before the workers start.
+
+    python migrations.py upgrade            # apply everything pending
+    python migrations.py upgrade --to 3     # stop at a version
+    python migrations.py current            # applied and latest version
+
+Each applied step is recorded in ``schema_migrations``. Startup only reads
+that table (``check_schema``), so workers booting together never race on DDL.
+Steps are idempotent: a database created by the old startup ``create_all``
+adopts the early versions without changes, and an interrupted step can be
+run again.
+
+Index builds use ``create_index_online``: ``CREATE INDEX CONCURRENTLY`` on
+PostgreSQL and ``ONLINE = ON`` on SQL Server (Enterprise/Azure SQL; other
+editions fall back to a regular build). SQLite has no online build, its
+index builds hold the write lock until they finish.
+
+Add new steps at the end of ``MIGRATIONS`` with the next version number;
+never edit a step that has shipped.
+"""
+import argparse
+import logging
+import sys
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy import (
+    Column, DateTime, Integer, LargeBinary, MetaData, String, Table, Text, func, insert, inspect, select, text
+)
+from sqlalchemy.exc import DBAPIError
+
+from models import SQLiteTimestamp
+from search import SEARCH_BACKENDS
+
+logger = logging.getLogger("resume.migrations")
+
+# Tables as they were when migrations were introduced; later changes get their own step
+_baseline = MetaData()
+Table(
+    "users", _baseline,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String, unique=True, nullable=False, index=True),
+    Column("password_hash", String, nullable=False),
+)
+Table(
+    "project_requests", _baseline,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False),
+    Column("email", String, nullable=False),
+    Column("project_description", Text, nullable=False),
+    Column("budget", String, nullable=True),
+    Column("timeline", String, nullable=True),
+    Column("project_type", String, nullable=True),
+    Column("status", String, default="pending"),
+    Column("created_at", DateTime(timezone=True).with_variant(SQLiteTimestamp, "sqlite"), server_default=func.now()),
+)
+Table(
+    "project_request_stats", _baseline,
+    Column("dimension", String(20), primary_key=True),
+    Column("value", String(255), primary_key=True),
+    Column("count", Integer, nullable=False, default=0),
+)
+Table(
+    "project_request_events", _baseline,
+    Column("id", Integer, primary_key=True),
+    Column("type", String(20), nullable=False),
+    Column("payload", Text, nullable=False),
+)
+
+# Added in version 6
+Table(
+    "project_request_archive", _baseline,
+    Column("id", Integer, primary_key=True),
+    Column("archived_at", DateTime(timezone=True), nullable=False),
+    Column("row_count", Integer, nullable=False),
+    Column("first_request_id", Integer, nullable=False),
+    Column("last_request_id", Integer, nullable=False),
+    Column("data", LargeBinary, nullable=False),
+)
+
+_versions = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _versions,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def autocommit(engine):
+    """A connection outside any transaction, for DDL that refuses to run inside one"""
+    return engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+
+def create_index_online(connection, name: str, table: str, columns: List[str]):
+    """CREATE INDEX without blocking writes where the dialect can; existing indexes are kept.
+
+    Needs an autocommit connection on PostgreSQL.
+    """
+    column_list = ", ".join(columns)
+    if connection.dialect.name == "postgresql":
+        valid = connection.execute(text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+        ), {"name": name}).scalar()
+        if valid:
+            return
+        if valid is False:
+            # Left behind by an interrupted concurrent build
+            connection.execute(text(f"DROP INDEX CONCURRENTLY {name}"))
+        connection.execute(text(f"CREATE INDEX CONCURRENTLY {name} ON {table} ({column_list})"))
+        return
+
+    if name in {index["name"] for index in inspect(connection).get_indexes(table)}:
+        return
+    statement = f"CREATE INDEX {name} ON {table} ({column_list})"
+    if connection.dialect.name == "mssql":
+        try:
+            connection.execute(text(f"{statement} WITH (ONLINE = ON)"))
+            return
+        except DBAPIError as e:
+            logger.warning(f"⚠️ Online index build unavailable, building {name} offline: {e}")
+    connection.execute(text(statement))
+
+
+def create_baseline_tables(engine):
+    with engine.begin() as connection:
+        _baseline.create_all(
+            connection, checkfirst=True,
+            tables=[_baseline.tables["users"], _baseline.tables["project_requests"]]
+        )
+
+
+def add_pagination_indexes(engine):
+    # Keyset pagination walks (created_at, id); the filtered listings lead with the filter column
+    with autocommit(engine) as connection:
+        create_index_online(connection, "ix_project_requests_created_at_id", "project_requests",
+                            ["created_at", "id"])
+        create_index_online(connection, "ix_project_requests_status_created_at_id", "project_requests",
+                            ["status", "created_at", "id"])
+        create_index_online(connection, "ix_project_requests_project_type_created_at_id", "project_requests",
+                            ["project_type", "created_at", "id"])
+
+
+def create_stats_and_event_tables(engine):
+    with engine.begin() as connection:
+        _baseline.create_all(
+            connection, checkfirst=True,
+            tables=[_baseline.tables["project_request_stats"], _baseline.tables["project_request_events"]]
+        )
+
+
+def add_search_index(engine):
+    # Errors propagate so a failed build is retried by the next upgrade instead of being
+    # recorded; until it succeeds startup detects no index and searches with LIKE
+    backend_class = SEARCH_BACKENDS.get(engine.dialect.name)
+    if backend_class is None:
+        return
+    backend = backend_class()
+    if backend.autocommit:
+        with autocommit(engine) as connection:
+            backend.setup(connection)
+    else:
+        with engine.begin() as connection:
+            backend.setup(connection)
+    with engine.connect() as connection:
+        if not backend.installed(connection):
+            raise RuntimeError(f"{backend.name} search index was not created")
+
+
+def seed_admin_user(engine):
+    from passwords import PasswordHasher
+
+    users = _baseline.tables["users"]
+    with engine.begin() as connection:
+        if connection.execute(select(users.c.id).where(users.c.username == "admin")).first() is None:
+            # Default password: admin123 (should be changed in production)
+            password_hash = PasswordHasher(workers=1).hash_sync("admin123")
+            connection.execute(insert(users).values(username="admin", password_hash=password_hash))
+            logger.info("Admin user created: username=admin, password=admin123")
+
+
+def create_archive_table(engine):
+    with engine.begin() as connection:
+        _baseline.create_all(connection, checkfirst=True, tables=[_baseline.tables["project_request_archive"]])
+
+
+def enable_sqlite_incremental_vacuum(engine):
+    # auto_vacuum only changes on a full VACUUM, which rewrites the whole file; later runs
+    # of the retention job can then give freed pages back in small incremental steps
+    if engine.dialect.name != "sqlite":
+        return
+    with autocommit(engine) as connection:
+        if connection.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+            connection.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            connection.execute(text("VACUUM"))
+
+
+class Migration:
+    __slots__ = ("version", "name", "upgrade")
+
+    def __init__(self, version: int, name: str, upgrade: Callable):
+        self.version = version
+        self.name = name
+        self.upgrade = upgrade
+
+
+MIGRATIONS = [
+    Migration(1, "baseline_tables", create_baseline_tables),
+    Migration(2, "pagination_indexes", add_pagination_indexes),
+    Migration(3, "stats_and_event_tables", create_stats_and_event_tables),
+    Migration(4, "search_index", add_search_index),
+    Migration(5, "admin_user", seed_admin_user),
+    Migration(6, "request_archive_table", create_archive_table),
+    Migration(7, "sqlite_incremental_vacuum", enable_sqlite_incremental_vacuum),
+]
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(connection) -> int:
+    """Highest applied version, 0 for a database that was never migrated"""
+    if not inspect(connection).has_table(schema_migrations.name):
+        return 0
+    return connection.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+
+
+def upgrade(engine, target: Optional[int] = None) -> List[Migration]:
+    """Apply pending migrations up to ``target`` (default: all); returns the ones applied"""
+    target = SCHEMA_VERSION if target is None else target
+    with engine.begin() as connection:
+        _versions.create_all(connection, checkfirst=True)
+        version = current_version(connection)
+    applied = []
+    for migration in MIGRATIONS:
+        if version < migration.version <= target:
+            logger.info(f"Applying migration {migration.version} ({migration.name})")
+            migration.upgrade(engine)
+            with engine.begin() as connection:
+                connection.execute(insert(schema_migrations).values(
+                    version=migration.version, name=migration.name, applied_at=datetime.now(timezone.utc)
+                ))
+            applied.append(migration)
+    return applied
+
+
+def check_schema(connection) -> int:
+    """Startup check: log when the database isn't at the version this code expects"""
+    version = current_version(connection)
+    if version < SCHEMA_VERSION:
+        logger.error(
+            f"⚠️ Database schema is at version {version}, this build needs {SCHEMA_VERSION}; "
+            "run `python migrations.py upgrade`"
+        )
+    elif version > SCHEMA_VERSION:
+        logger.warning(f"⚠️ Database schema version {version} is newer than this build ({SCHEMA_VERSION})")
+    return version
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = commands.add_parser("upgrade", help="apply pending migrations")
+    upgrade_parser.add_argument("--to", type=int, default=None, help="stop at this version")
+    commands.add_parser("current", help="print the applied and latest version")
+    args = parser.parse_args()
+
+    from database import engine
+    from logging_setup import configure_logging
+    configure_logging()
+
+    if args.command == "upgrade":
+        applied = upgrade(engine, args.to)
+        for migration in applied:
+            print(f"applied {migration.version} {migration.name}")
+        with engine.connect() as connection:
+            print(f"✅ Database schema at version {current_version(connection)}")
+    else:
+        with engine.connect() as connection:
+            print(f"current {current_version(connection)}, latest {SCHEMA_VERSION}")
+            for migration in MIGRATIONS:
+                print(f"  {migration.version} {migration.name}")
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -1,7 +1,30 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import timezone
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, LargeBinary
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 from database import Base
 
+class SQLiteTimestamp(TypeDecorator):
+    """SQLite stores CURRENT_TIMESTAMP in UTC without fractional seconds or offset; bind
+    datetimes the same way so range and keyset comparisons on created_at line up with
+    stored values. Aware datetimes are converted to UTC first; naive ones are taken as UTC."""
+    impl = sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    )
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+# The app doesn't create tables: every schema change here needs a new step in migrations.py
+
+# Allowed values for ProjectRequest.status
+REQUEST_STATUSES = ("pending", "in_progress", "completed", "rejected")
+
 class ProjectRequest(Base):
     __tablename__ = "project_requests"
     
@@ -13,7 +36,41 @@ class ProjectRequest(Base):
     timeline = Column(String, nullable=True)
     project_type = Column(String, nullable=True)
     status = Column(String, default="pending")  # pending, in_progress, completed, rejected
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True).with_variant(SQLiteTimestamp, "sqlite"), server_default=func.now())
+
+    # Keyset pagination walks (created_at, id); the filtered listings lead with the filter column
+    __table_args__ = (
+        Index("ix_project_requests_created_at_id", "created_at", "id"),
+        Index("ix_project_requests_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_project_requests_project_type_created_at_id", "project_type", "created_at", "id"),
+    )
+
+class ProjectRequestStat(Base):
+    """Running counts behind /api/project-requests/stats, updated by every write path"""
+    __tablename__ = "project_request_stats"
+
+    dimension = Column(String(20), primary_key=True)  # total, status, project_type, day
+    value = Column(String(255), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class ProjectRequestEvent(Base):
+    """Change feed for the admin WebSocket; ids are the resume positions"""
+    __tablename__ = "project_request_events"
+
+    id = Column(Integer, primary_key=True)
+    type = Column(String(20), nullable=False)  # created, status_changed, deleted
+    payload = Column(Text, nullable=False)  # JSON
+
+class ProjectRequestArchive(Base):
+    """Finished requests moved out of project_requests by retention.py, one compressed batch per row"""
+    __tablename__ = "project_request_archive"
+
+    id = Column(Integer, primary_key=True)
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+    row_count = Column(Integer, nullable=False)
+    first_request_id = Column(Integer, nullable=False)
+    last_request_id = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)  # gzip'd NDJSON, one request per line
 
 class User(Base):
     __tablename__ = "users"
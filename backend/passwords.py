@@ -0,0 +1,104 @@
+"""Password hashing for the admin login.
+
+Hashes use the stdlib scrypt KDF and are computed in a small thread pool
+(scrypt releases the GIL), so a login doesn't stall the event loop. At most
+``max_pending`` hashes run or wait at once; beyond that callers get
+``PasswordHasherBusy`` instead of queueing without limit.
+
+Stored format: ``scrypt$<n>$<r>$<p>$<salt>$<hash>`` with base64 salt/hash.
+Legacy unsalted sha256 hex digests still verify and are flagged for rehash.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+# KDF cost and concurrency settings
+PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14)))
+PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))  # running + waiting hashes
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashes are already running or queued"""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def is_legacy_hash(stored: str) -> bool:
+    return len(stored) == 64 and all(c in "0123456789abcdef" for c in stored)
+
+
+class PasswordHasher:
+    """scrypt hashing on a bounded thread pool"""
+
+    def __init__(self, n: int = PASSWORD_SCRYPT_N, r: int = PASSWORD_SCRYPT_R, p: int = PASSWORD_SCRYPT_P,
+                 workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.n = n
+        self.r = r
+        self.p = p
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._pending = 0
+        # Verified against when the username doesn't exist so both paths cost the same
+        self._dummy_hash = self.hash_sync(os.urandom(16).hex())
+
+    def _derive(self, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r + 1024 * 1024, dklen=KEY_BYTES)
+
+    def hash_sync(self, password: str) -> str:
+        """Hash on the calling thread; for startup code outside the event loop"""
+        salt = os.urandom(SALT_BYTES)
+        key = self._derive(password, salt, self.n, self.r, self.p)
+        return f"scrypt${self.n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify_sync(self, password: str, stored: Optional[str]) -> Tuple[bool, bool]:
+        """Return (matches, needs_rehash) for a stored hash"""
+        if stored is None:
+            self.verify_sync(password, self._dummy_hash)
+            return False, False
+        if is_legacy_hash(stored):
+            matches = hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+            return matches, matches
+        try:
+            scheme, n, r, p, salt, key = stored.split("$")
+            n, r, p = int(n), int(r), int(p)
+        except ValueError:
+            return False, False
+        if scheme != "scrypt":
+            return False, False
+        matches = hmac.compare_digest(self._derive(password, _b64decode(salt), n, r, p), _b64decode(key))
+        return matches, matches and (n, r, p) != (self.n, self.r, self.p)
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_pending:
+            raise PasswordHasherBusy()
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hash_sync, password)
+
+    async def verify(self, password: str, stored: Optional[str]) -> Tuple[bool, bool]:
+        return await self._run(self.verify_sync, password, stored)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
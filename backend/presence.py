@@ -0,0 +1,115 @@
+"""Presence backends for the /ws/online-users counter.
+
+Each worker publishes how many sockets it holds locally and reads back the
+global total. The in-memory backend is the single-worker default; the SQLite
+backend shares counts between workers on the same host through a small file
+database, with stale entries from crashed workers expiring after ``ttl``.
+"""
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+# Presence configuration
+PRESENCE_BACKEND = os.getenv("PRESENCE_BACKEND", "memory")  # memory | sqlite
+PRESENCE_DB_PATH = os.getenv("PRESENCE_DB_PATH", "/tmp/presence.db")
+PRESENCE_SYNC_INTERVAL = float(os.getenv("PRESENCE_SYNC_INTERVAL", "1.0"))  # seconds between heartbeats
+PRESENCE_TTL = float(os.getenv("PRESENCE_TTL", "10.0"))  # seconds before a silent worker is ignored
+
+
+class PresenceBackend:
+    """Interface for sharing per-worker connection counts"""
+
+    # How often the broadcaster should resync even without local changes.
+    # None means the total only changes when this worker publishes.
+    sync_interval: Optional[float] = None
+
+    async def publish(self, local_count: int) -> None:
+        raise NotImplementedError
+
+    async def total(self) -> int:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryPresenceBackend(PresenceBackend):
+    """Single-process backend: the global count is the local count"""
+
+    def __init__(self):
+        self._count = 0
+
+    async def publish(self, local_count: int) -> None:
+        self._count = local_count
+
+    async def total(self) -> int:
+        return self._count
+
+
+class SQLitePresenceBackend(PresenceBackend):
+    """Shares counts between worker processes through a SQLite file"""
+
+    def __init__(self, path: str = PRESENCE_DB_PATH, sync_interval: float = PRESENCE_SYNC_INTERVAL,
+                 ttl: float = PRESENCE_TTL, worker_id: Optional[str] = None):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.ttl = ttl
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS presence ("
+                "worker_id TEXT PRIMARY KEY, count INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _publish(self, local_count: int):
+        with self._lock:
+            self._connection().execute(
+                "INSERT INTO presence (worker_id, count, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(worker_id) DO UPDATE SET count = excluded.count, updated_at = excluded.updated_at",
+                (self.worker_id, local_count, time.time()),
+            )
+
+    def _total(self) -> int:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT COALESCE(SUM(count), 0) FROM presence WHERE updated_at >= ?",
+                (time.time() - self.ttl,),
+            ).fetchone()
+        return int(row[0])
+
+    def _close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM presence WHERE worker_id = ?", (self.worker_id,))
+                self._conn.close()
+                self._conn = None
+
+    async def publish(self, local_count: int) -> None:
+        await asyncio.to_thread(self._publish, local_count)
+
+    async def total(self) -> int:
+        return await asyncio.to_thread(self._total)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close)
+
+
+def get_presence_backend(name: str = PRESENCE_BACKEND) -> PresenceBackend:
+    """Build the presence backend selected by PRESENCE_BACKEND"""
+    if name == "memory":
+        return InMemoryPresenceBackend()
+    if name == "sqlite":
+        return SQLitePresenceBackend()
+    raise ValueError(f"Unknown presence backend: {name}")
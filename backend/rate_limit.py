@@ -0,0 +1,145 @@
+"""Token-bucket rate limiting for the public write and login endpoints.
+
+Buckets are keyed by route scope and client IP. The in-memory store keeps at
+most ``max_keys`` buckets and evicts the least recently used ones, which are
+also the idlest. The SQLite store shares buckets between worker processes on
+the same host.
+"""
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi import Request
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory | sqlite
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "/tmp/ratelimit.db")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Take the client address from X-Forwarded-For (only behind a trusted proxy)
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "0") == "1"
+# Proxies in front of the app that append to X-Forwarded-For; the client is that many entries from the right
+RATE_LIMIT_PROXY_HOPS = max(1, int(os.getenv("RATE_LIMIT_PROXY_HOPS", "1")))
+
+
+class RateLimit:
+    """``requests`` per ``seconds``, allowing bursts of up to ``requests``"""
+
+    def __init__(self, requests: int, seconds: float):
+        self.capacity = float(requests)
+        self.refill_per_second = requests / seconds
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse ``"<requests>/<seconds>"``, e.g. ``"5/60"``"""
+        requests, seconds = value.split("/")
+        return cls(int(requests), float(seconds))
+
+
+def _take(tokens: float, updated: float, limit: RateLimit, now: float) -> Tuple[float, bool, float]:
+    """Refill a bucket and try to take one token; returns (tokens, allowed, retry_after)"""
+    tokens = min(limit.capacity, tokens + (now - updated) * limit.refill_per_second)
+    if tokens >= 1.0:
+        return tokens - 1.0, True, 0.0
+    return tokens, False, (1.0 - tokens) / limit.refill_per_second
+
+
+class MemoryRateLimitStore:
+    """Per-process buckets in a bounded LRU"""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens, allowed, retry_after = _take(limit.capacity, now, limit, now)
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            tokens, allowed, retry_after = _take(bucket[0], bucket[1], limit, now)
+            self._buckets.move_to_end(key)
+        self._buckets[key] = (tokens, now)
+        return allowed, retry_after
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SQLiteRateLimitStore:
+    """Buckets shared between workers through a SQLite file"""
+
+    CLEANUP_EVERY = 1000  # hits between purges of idle buckets
+    IDLE_SECONDS = 3600
+
+    def __init__(self, path: str = RATE_LIMIT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._hits = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _hit(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated_at FROM rate_limits WHERE key = ?", (key,)).fetchone()
+                tokens, updated = row if row else (limit.capacity, now)
+                tokens, allowed, retry_after = _take(tokens, updated, limit, now)
+                conn.execute(
+                    "INSERT INTO rate_limits (key, tokens, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                    (key, tokens, now),
+                )
+                self._hits += 1
+                if self._hits % self.CLEANUP_EVERY == 0:
+                    conn.execute("DELETE FROM rate_limits WHERE updated_at < ?", (now - self.IDLE_SECONDS,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return allowed, retry_after
+
+    async def hit(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        return await asyncio.to_thread(self._hit, key, limit)
+
+
+def get_rate_limit_store(name: str = RATE_LIMIT_BACKEND):
+    """Build the store selected by RATE_LIMIT_BACKEND"""
+    if name == "memory":
+        return MemoryRateLimitStore()
+    if name == "sqlite":
+        return SQLiteRateLimitStore()
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        # Entries left of the ones our proxies appended come from the client and can be forged
+        entries = [entry.strip() for entry in request.headers.get("x-forwarded-for", "").split(",") if entry.strip()]
+        if entries:
+            return entries[-min(RATE_LIMIT_PROXY_HOPS, len(entries))]
+    return request.client.host if request.client else "unknown"
+
+
+def retry_after_header(retry_after: float) -> str:
+    return str(max(1, math.ceil(retry_after)))
@@ -0,0 +1,243 @@
+"""Archival of old, finished project requests and compaction of the table.
+
+A background task periodically moves requests in a terminal status
+(completed, rejected) older than ``RETENTION_DAYS`` out of
+``project_requests``. Each batch is one short transaction: ``DELETE ...
+RETURNING`` takes at most ``batch_size`` rows, and they are stored gzip'd
+(NDJSON, one request per line, same fields as the export) in one
+``project_request_archive`` row. The stats delta and an admin "deleted"
+event are written in the same transaction. Between batches the job pauses
+so regular writers get the lock.
+
+After archiving, the freed space is compacted. SQLite uses incremental
+vacuum in small steps (it needs auto_vacuum=INCREMENTAL, which migration 7
+sets) followed by a bounded ANALYZE. PostgreSQL runs VACUUM ANALYZE.
+SQL Server updates statistics. Every run reports the rows archived and
+the net bytes reclaimed, ``size_before - size_after``. On SQLite that is the
+whole database file, which also holds the archive rows, so it can be
+negative when compaction freed less than the archive added; elsewhere it is
+the size of ``project_requests`` and its indexes.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy import delete, insert, select, text
+
+from serialization import json_default
+from stats import StatsDelta
+
+logger = logging.getLogger("resume.retention")
+
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "180"))  # age after which finished requests are archived
+RETENTION_STATUSES = tuple(os.getenv("RETENTION_STATUSES", "completed,rejected").split(","))
+RETENTION_INTERVAL = float(os.getenv("RETENTION_INTERVAL", "21600"))  # seconds between runs, 0 disables
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+RETENTION_MAX_BATCHES = int(os.getenv("RETENTION_MAX_BATCHES", "200"))  # per run; the rest waits for the next
+RETENTION_BATCH_PAUSE = float(os.getenv("RETENTION_BATCH_PAUSE", "0.05"))  # seconds between batches
+RETENTION_VACUUM_PAGES = int(os.getenv("RETENTION_VACUUM_PAGES", "1000"))  # SQLite pages freed per step
+
+ARCHIVE_FIELDS = ("id", "name", "email", "project_description", "budget", "timeline",
+                  "project_type", "status", "created_at")
+
+
+def compress_rows(rows: List[dict]) -> bytes:
+    """gzip'd NDJSON; ``zcat`` or ``decompress_rows`` reads it back"""
+    lines = "".join(json.dumps(row, default=json_default, ensure_ascii=False) + "\n" for row in rows)
+    compressor = zlib.compressobj(level=9, wbits=31)
+    return compressor.compress(lines.encode()) + compressor.flush()
+
+
+def decompress_rows(data: bytes) -> List[dict]:
+    return [json.loads(line) for line in zlib.decompress(data, wbits=31).decode().splitlines()]
+
+
+class RetentionJob:
+    """Archives finished requests in batches, then compacts the table"""
+
+    def __init__(self, request_model, archive_model, session_factory, engine, stats=None, events=None,
+                 on_archived: Optional[Callable[[], None]] = None, days: int = RETENTION_DAYS,
+                 statuses=RETENTION_STATUSES, interval: float = RETENTION_INTERVAL,
+                 batch_size: int = RETENTION_BATCH_SIZE, max_batches: int = RETENTION_MAX_BATCHES,
+                 batch_pause: float = RETENTION_BATCH_PAUSE):
+        self.request_model = request_model
+        self.archive_model = archive_model
+        self.session_factory = session_factory
+        self.engine = engine
+        self.stats = stats
+        self.events = events
+        self.on_archived = on_archived  # after each committed batch, e.g. to drop cached counts
+        self.days = days
+        self.statuses = statuses
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.batch_pause = batch_pause
+        self.last_report: Optional[dict] = None
+        self.rows_archived = 0
+        self.bytes_reclaimed = 0  # net, summed over runs; negative while the archive outgrows what was freed
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.interval > 0 and self.days > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> dict:
+        """Archive everything due (up to ``max_batches``), compact, and report what was reclaimed"""
+        async with self._lock:
+            started = time.perf_counter()
+            cutoff = datetime.now(timezone.utc) - timedelta(days=self.days)
+            size_before = await self._table_bytes()
+            rows = batches = raw_bytes = archive_bytes = 0
+            while batches < self.max_batches:
+                archived, raw, compressed = await self._archive_batch(cutoff)
+                if not archived:
+                    break
+                rows += archived
+                raw_bytes += raw
+                archive_bytes += compressed
+                batches += 1
+                if self.on_archived is not None:
+                    self.on_archived()
+                await asyncio.sleep(self.batch_pause)
+            if rows:
+                await self._compact()
+            size_after = await self._table_bytes()
+            reclaimed = size_before - size_after if size_before is not None and size_after is not None else None
+
+            self.rows_archived += rows
+            self.bytes_reclaimed += reclaimed or 0
+            self.last_report = {
+                "finished_at": datetime.now(timezone.utc),
+                "cutoff": cutoff,
+                "statuses": list(self.statuses),
+                "rows_archived": rows,
+                "batches": batches,
+                "complete": batches < self.max_batches,
+                "raw_bytes": raw_bytes,
+                "archive_bytes": archive_bytes,
+                "size_scope": "database" if self.engine.dialect.name == "sqlite" else "table",
+                "size_before": size_before,
+                "size_after": size_after,
+                "bytes_reclaimed": reclaimed,
+                "seconds": round(time.perf_counter() - started, 3),
+            }
+            if rows:
+                logger.info(
+                    f"✅ Archived {rows} requests in {batches} batches "
+                    f"({raw_bytes} bytes -> {archive_bytes} compressed), net bytes reclaimed: {reclaimed}",
+                    extra={"rows_archived": rows, "bytes_reclaimed": reclaimed}
+                )
+            return self.last_report
+
+    async def _archive_batch(self, cutoff: datetime):
+        """Move one batch into the archive; returns (rows, raw bytes, compressed bytes)"""
+        model = self.request_model
+        columns = [getattr(model, field) for field in ARCHIVE_FIELDS]
+        due = (model.status.in_(self.statuses), model.created_at < cutoff)
+        batch_ids = select(model.id).where(*due).order_by(model.id).limit(self.batch_size)
+        async with self.session_factory() as db:
+            if db.bind.dialect.delete_returning:
+                # The DELETE takes the write lock first, so exactly the rows removed get archived
+                result = await db.execute(delete(model).where(model.id.in_(batch_ids)).returning(*columns))
+                rows = [dict(zip(ARCHIVE_FIELDS, row)) for row in result.all()]
+            else:
+                rows = [dict(zip(ARCHIVE_FIELDS, row)) for row in
+                        (await db.execute(select(*columns).where(model.id.in_(batch_ids)))).all()]
+                ids = [row["id"] for row in rows]
+                await db.execute(delete(model).where(model.id.in_(ids), *due))
+            if not rows:
+                return 0, 0, 0
+            rows.sort(key=lambda row: row["id"])
+
+            data = compress_rows(rows)
+            await db.execute(insert(self.archive_model).values(
+                archived_at=datetime.now(timezone.utc),
+                row_count=len(rows),
+                first_request_id=rows[0]["id"],
+                last_request_id=rows[-1]["id"],
+                data=data,
+            ))
+            if self.stats is not None:
+                delta = StatsDelta()
+                for row in rows:
+                    delta.remove(row["status"], row["project_type"], row["created_at"])
+                await self.stats.apply(db, delta)
+            if self.events is not None:
+                await self.events.record(db, "deleted", request_ids=[row["id"] for row in rows], reason="archived")
+            await db.commit()
+        if self.events is not None:
+            self.events.notify()
+        raw = sum(len(json.dumps(row, default=json_default, ensure_ascii=False)) + 1 for row in rows)
+        return len(rows), raw, len(data)
+
+    async def _table_bytes(self) -> Optional[int]:
+        """Database file size on SQLite, the table's on-disk size elsewhere"""
+        dialect = self.engine.dialect.name
+        try:
+            async with self.engine.connect() as connection:
+                if dialect == "sqlite":
+                    page_count = (await connection.execute(text("PRAGMA page_count"))).scalar()
+                    page_size = (await connection.execute(text("PRAGMA page_size"))).scalar()
+                    return page_count * page_size
+                if dialect == "postgresql":
+                    return (await connection.execute(text("SELECT pg_total_relation_size('project_requests')"))).scalar()
+                if dialect == "mssql":
+                    return (await connection.execute(text(
+                        "SELECT SUM(reserved_page_count) * 8192 FROM sys.dm_db_partition_stats "
+                        "WHERE object_id = OBJECT_ID('project_requests')"
+                    ))).scalar()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read the table size: {e}")
+        return None
+
+    async def _compact(self):
+        dialect = self.engine.dialect.name
+        try:
+            async with self.engine.connect() as connection:
+                connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                if dialect == "sqlite":
+                    await self._compact_sqlite(connection)
+                elif dialect == "postgresql":
+                    await connection.execute(text("VACUUM (ANALYZE) project_requests"))
+                elif dialect == "mssql":
+                    await connection.execute(text("UPDATE STATISTICS project_requests"))
+        except Exception as e:
+            logger.warning(f"⚠️ Compaction after archiving failed: {e}")
+
+    async def _compact_sqlite(self, connection):
+        if (await connection.execute(text("PRAGMA auto_vacuum"))).scalar() == 2:
+            # Each step holds the write lock only while it frees RETENTION_VACUUM_PAGES pages.
+            # executescript runs the pragma to completion; a plain execute frees a single page.
+            raw = (await connection.get_raw_connection()).driver_connection
+            while (await connection.execute(text("PRAGMA freelist_count"))).scalar():
+                await raw.executescript(f"PRAGMA incremental_vacuum({RETENTION_VACUUM_PAGES});")
+                await asyncio.sleep(self.batch_pause)
+        else:
+            logger.warning("⚠️ SQLite auto_vacuum is not INCREMENTAL, freed pages stay in the file; "
+                           "run `python migrations.py upgrade`")
+        await connection.execute(text("PRAGMA analysis_limit=1000"))
+        await connection.execute(text("ANALYZE project_requests"))
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"⚠️ Retention run failed: {e}")
@@ -0,0 +1,235 @@
+"""Full-text search over project requests.
+
+Each backend creates its text index in a migration and turns a parsed query into
+a subquery of ``(id, rank)`` rows, where a lower rank is a better match:
+
+- SQLite: an FTS5 external-content table kept in sync by triggers, ranked
+  with bm25, with prefix indexes for 2-3 character ``term*`` queries
+  (longer prefixes work too, but merge every matching term).
+- PostgreSQL: a generated, weighted ``tsvector`` column with a GIN index,
+  ranked with ``ts_rank_cd``.
+- MSSQL: a full-text index (change tracking AUTO) queried with CONTAINSTABLE.
+
+Because the database maintains the index inside the writing transaction,
+every write path (single, bulk, buffered ingest) stays in sync without extra
+code in the routes. The index is created by a migration (see migrations.py);
+at startup ``detect_search_backend`` only checks that it exists and falls
+back to ``LikeSearch``, an unranked substring scan, if it doesn't.
+"""
+import logging
+import os
+import re
+from typing import List, Tuple
+
+from sqlalchemy import column, func, literal, literal_column, or_, select, table, text
+from sqlalchemy.sql import Subquery
+
+logger = logging.getLogger("resume.search")
+
+SEARCH_MAX_RANKED = int(os.getenv("SEARCH_MAX_RANKED", "2000"))  # broader queries sort newest first; 0 always ranks
+MAX_TERMS = 16
+_TERM = re.compile(r"\w+\*?", re.UNICODE)
+
+
+def parse_terms(query: str, prefix_last: bool = False) -> List[Tuple[str, bool]]:
+    """Split a user query into (term, is_prefix) pairs; ``word*`` asks for a prefix match"""
+    terms = [(token.rstrip("*"), token.endswith("*")) for token in _TERM.findall(query)][:MAX_TERMS]
+    if terms and prefix_last and len(terms[-1][0]) >= 2:
+        terms[-1] = (terms[-1][0], True)
+    return terms
+
+
+class SearchBackend:
+    name = "none"
+    autocommit = False  # run setup outside a transaction
+
+    def setup(self, connection):
+        """Create the text index if missing (runs on a sync engine connection)"""
+
+    def installed(self, connection) -> bool:
+        """Whether ``setup`` has run against this database"""
+        return True
+
+    def match(self, model, terms: List[Tuple[str, bool]]) -> Subquery:
+        raise NotImplementedError
+
+
+class SQLiteFTSSearch(SearchBackend):
+    name = "sqlite_fts5"
+    TABLE = "project_requests_fts"
+
+    def installed(self, connection):
+        return connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": self.TABLE}
+        ).first() is not None
+
+    def setup(self, connection):
+        exists = self.installed(connection)
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.TABLE} USING fts5("
+            "name, email, project_description, "
+            "content='project_requests', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        ))
+        columns = "name, email, project_description"
+        new_values = "new.name, new.email, new.project_description"
+        old_values = "old.name, old.email, old.project_description"
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {self.TABLE}_ai AFTER INSERT ON project_requests BEGIN "
+            f"INSERT INTO {self.TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {self.TABLE}_ad AFTER DELETE ON project_requests BEGIN "
+            f"INSERT INTO {self.TABLE}({self.TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+        ))
+        # Status changes don't touch indexed columns, so they skip the index entirely
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {self.TABLE}_au AFTER UPDATE OF {columns} ON project_requests BEGIN "
+            f"INSERT INTO {self.TABLE}({self.TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {self.TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        ))
+        if not exists:
+            # Index rows that were there before the search table
+            connection.execute(text(f"INSERT INTO {self.TABLE}({self.TABLE}) VALUES ('rebuild')"))
+
+    def match(self, model, terms):
+        fts_query = " ".join(f'"{term}"' + ("*" if is_prefix else "") for term, is_prefix in terms)
+        fts = table(self.TABLE, column("rowid"))
+        fts_column = literal_column(self.TABLE)
+        # Weights follow the column order: name, email, project_description
+        rank = func.bm25(fts_column, 3.0, 2.0, 1.0)
+        return select(fts.c.rowid.label("id"), rank.label("rank")).where(fts_column.op("MATCH")(fts_query)).subquery()
+
+
+class PostgresSearch(SearchBackend):
+    name = "postgresql_tsvector"
+    autocommit = True  # CREATE INDEX CONCURRENTLY can't run inside a transaction
+
+    def installed(self, connection):
+        return connection.execute(text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = 'ix_project_requests_search_vector' AND i.indisvalid"
+        )).first() is not None
+
+    def setup(self, connection):
+        # Adding a stored generated column rewrites the table; the GIN index is then built without blocking writes
+        connection.execute(text(
+            "ALTER TABLE project_requests ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(email, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(project_description, '')), 'C')) STORED"
+        ))
+        if not self.installed(connection):
+            # A failed concurrent build leaves an invalid index behind; drop it and build again
+            connection.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_project_requests_search_vector"))
+            connection.execute(text(
+                "CREATE INDEX CONCURRENTLY ix_project_requests_search_vector "
+                "ON project_requests USING GIN (search_vector)"
+            ))
+
+    def match(self, model, terms):
+        # Terms are \w-only, so they're safe inside to_tsquery syntax
+        ts_query = func.to_tsquery(
+            "simple", " & ".join(term + (":*" if is_prefix else "") for term, is_prefix in terms)
+        )
+        vector = literal_column("project_requests.search_vector")
+        return select(model.id.label("id"), (-func.ts_rank_cd(vector, ts_query)).label("rank")).where(
+            vector.op("@@")(ts_query)
+        ).subquery()
+
+
+class MSSQLSearch(SearchBackend):
+    name = "mssql_fulltext"
+    autocommit = True  # full-text DDL can't run inside a user transaction
+    CATALOG = "resume_catalog"
+
+    def installed(self, connection):
+        return connection.execute(text(
+            "SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('project_requests')"
+        )).first() is not None
+
+    def setup(self, connection):
+        if connection.execute(text("SELECT 1 FROM sys.fulltext_catalogs WHERE name = :name"),
+                              {"name": self.CATALOG}).first() is None:
+            connection.execute(text(f"CREATE FULLTEXT CATALOG {self.CATALOG}"))
+        if not self.installed(connection):
+            key_index = connection.execute(text(
+                "SELECT name FROM sys.indexes WHERE object_id = OBJECT_ID('project_requests') AND is_primary_key = 1"
+            )).scalar_one()
+            connection.execute(text(
+                f"CREATE FULLTEXT INDEX ON project_requests (name, email, project_description) "
+                f"KEY INDEX [{key_index}] ON {self.CATALOG} WITH CHANGE_TRACKING AUTO"
+            ))
+
+    def match(self, model, terms):
+        contains = " AND ".join(f'"{term}*"' if is_prefix else f'"{term}"' for term, is_prefix in terms)
+        return text(
+            "SELECT [KEY] AS id, -[RANK] AS rank "
+            "FROM CONTAINSTABLE(project_requests, (name, email, project_description), :contains)"
+        ).bindparams(contains=contains).columns(column("id"), column("rank")).subquery()
+
+
+class LikeSearch(SearchBackend):
+    """Unindexed fallback: every term must appear in one of the text columns"""
+
+    name = "like"
+
+    def match(self, model, terms):
+        conditions = []
+        for term, _ in terms:
+            pattern = "%" + term.replace("_", "\\_") + "%"
+            conditions.append(or_(*(
+                column_.ilike(pattern, escape="\\")
+                for column_ in (model.name, model.email, model.project_description)
+            )))
+        return select(model.id.label("id"), literal(0).label("rank")).where(*conditions).subquery()
+
+
+async def search(db, backend: SearchBackend, model, terms: List[Tuple[str, bool]], skip: int, limit: int,
+                 restrict=None, max_ranked: int = SEARCH_MAX_RANKED) -> Tuple[list, str]:
+    """One page of ``model`` rows for ``terms``; returns (rows, order).
+
+    Queries matching at most ``max_ranked`` rows come back best match first
+    (order ``"rank"``). Broader ones come back newest first (``"recent"``):
+    ranking would have to score most of the table, and a word found in most
+    requests says little about relevance anyway. ``restrict`` is an optional
+    select of allowed ids (e.g. a status filter). Full rows are loaded for
+    the returned page only.
+    """
+    matches = backend.match(model, terms)
+    candidates = select(matches.c.id, matches.c.rank)
+    if restrict is not None:
+        candidates = candidates.where(matches.c.id.in_(restrict))
+    candidates = candidates.subquery()
+
+    order = "rank"
+    if max_ranked:
+        probe = select(candidates.c.id).limit(max_ranked + 1).subquery()
+        if (await db.execute(select(func.count()).select_from(probe))).scalar_one() > max_ranked:
+            order = "recent"
+
+    if order == "rank":
+        page = select(candidates.c.id, candidates.c.rank.label("sort_key")).order_by(
+            candidates.c.rank, candidates.c.id.desc()
+        )
+    else:
+        page = select(candidates.c.id, (-candidates.c.id).label("sort_key")).order_by(candidates.c.id.desc())
+    page = page.offset(skip).limit(limit).subquery()
+    query = select(model).join(page, model.id == page.c.id).order_by(page.c.sort_key, model.id.desc())
+    return (await db.execute(query)).scalars().all(), order
+
+
+SEARCH_BACKENDS = {"sqlite": SQLiteFTSSearch, "postgresql": PostgresSearch, "mssql": MSSQLSearch}
+
+
+def detect_search_backend(connection) -> SearchBackend:
+    """The indexed backend if its index exists, else LIKE; only reads the catalog, no DDL"""
+    backend_class = SEARCH_BACKENDS.get(connection.dialect.name)
+    if backend_class is not None:
+        backend = backend_class()
+        try:
+            if backend.installed(connection):
+                return backend
+        except Exception as e:
+            logger.warning(f"⚠️ Could not check the full-text index ({backend.name}): {e}")
+    return LikeSearch()
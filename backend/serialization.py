@@ -0,0 +1,52 @@
+"""Fast JSON responses for read-heavy endpoints.
+
+Routes on the fast path select plain column tuples instead of ORM objects
+and return a ``FastJSONResponse``, which skips FastAPI's per-row response
+model validation and encodes with orjson when it's installed. The output
+matches what the Pydantic response model produces (ISO datetimes, ``Z`` for
+UTC), so clients can't tell the paths apart.
+"""
+import json
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, Sequence
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is slower but equivalent
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        if value.utcoffset() is not None and value.utcoffset() == timezone.utc.utcoffset(None):
+            text = text[:-6] + "Z"
+        return text
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_default(value: Any) -> str:
+    """Lenient ``default=`` for json.dumps on stored payloads: ISO dates, anything else as str"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows_to_dicts(fields: Sequence[str], rows: Iterable[tuple]) -> list:
+    """Column tuples (in ``fields`` order) to JSON-ready dicts"""
+    return [dict(zip(fields, row)) for row in rows]
@@ -0,0 +1,107 @@
+"""In-memory static asset cache for the frontend pages and stylesheets.
+
+Files are read once at startup together with gzip/brotli variants and a
+strong ETag per representation, so serving them needs no filesystem access.
+"""
+import gzip
+import hashlib
+import os
+from typing import Dict, Optional, Set
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Cache lifetimes. HTML names aren't fingerprinted, so by default pages are
+# revalidated through their ETag while stylesheets are cached for a day.
+HTML_MAX_AGE = int(os.getenv("HTML_MAX_AGE", "0"))
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "86400"))
+MIN_COMPRESS_SIZE = 512
+
+MEDIA_TYPES = {
+    ".html": "text/html",
+    ".css": "text/css",
+}
+
+
+class StaticAsset:
+    """One file with its precomputed encodings and ETags"""
+
+    def __init__(self, name: str, body: bytes):
+        self.name = name
+        extension = os.path.splitext(name)[1]
+        self.media_type = MEDIA_TYPES.get(extension, "application/octet-stream")
+        max_age = HTML_MAX_AGE if extension == ".html" else STATIC_MAX_AGE
+        self.cache_control = f"public, max-age={max_age}" if max_age else "no-cache"
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants: Dict[Optional[str], bytes] = {None: body}
+        self.etags: Dict[Optional[str], str] = {None: f'"{digest}"'}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            encoded = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                encoded["br"] = brotli.compress(body, quality=11)
+            for encoding, data in encoded.items():
+                if len(data) < len(body):
+                    self.variants[encoding] = data
+                    self.etags[encoding] = f'"{digest}-{encoding}"'
+
+    def response(self, request: Request) -> Response:
+        encoding = self._choose_encoding(request.headers.get("accept-encoding", ""))
+        headers = {
+            "ETag": self.etags[encoding],
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and self._matches(if_none_match):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.variants[encoding], media_type=self.media_type, headers=headers)
+
+    def _choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.variants:
+                return encoding
+        return None
+
+    def _matches(self, if_none_match: str) -> bool:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return any(etag in candidates for etag in self.etags.values())
+
+
+def _accepted_encodings(header: str) -> Set[str]:
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+class StaticAssetCache:
+    """Frontend files held in memory, keyed by file name"""
+
+    def __init__(self):
+        self.assets: Dict[str, StaticAsset] = {}
+
+    def load(self, static_dir: str, names) -> None:
+        for name in names:
+            path = os.path.join(static_dir, name)
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    self.assets[name] = StaticAsset(name, f.read())
+
+    def get(self, name: str) -> Optional[StaticAsset]:
+        return self.assets.get(name)
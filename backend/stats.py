@@ -0,0 +1,176 @@
+"""Dashboard aggregates kept in a summary table.
+
+Every write path adds a ``StatsDelta`` to the summary table in its own
+transaction, so the counts by status, project type and creation day commit or
+roll back together with the rows they describe. Reading the stats is then a
+scan of a few dozen summary rows instead of the request table. A background
+task periodically rebuilds the table from ``project_requests`` to repair any
+drift (e.g. rows changed outside the API).
+"""
+import asyncio
+import logging
+import os
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import Date, cast, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+logger = logging.getLogger("resume.stats")
+
+STATS_RECENT_DAYS = int(os.getenv("STATS_RECENT_DAYS", "30"))
+STATS_RECONCILE_INTERVAL = float(os.getenv("STATS_RECONCILE_INTERVAL", "300"))  # seconds, 0 disables
+
+UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def _day(created_at) -> str:
+    """Day bucket for a datetime, a date or a "YYYY-MM-DD..." string (None means now)"""
+    if created_at is None:
+        created_at = datetime.now(timezone.utc)
+    if isinstance(created_at, str):
+        return created_at[:10]
+    return created_at.strftime("%Y-%m-%d")
+
+
+class StatsDelta:
+    """Pending changes to the summary counts, keyed by (dimension, value)"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def add(self, status: Optional[str], project_type: Optional[str], created_at=None, n: int = 1):
+        self.counts[("total", "")] += n
+        self.counts[("status", status or "pending")] += n
+        self.counts[("project_type", project_type or "")] += n
+        self.counts[("day", _day(created_at))] += n
+        return self
+
+    def remove(self, status: Optional[str], project_type: Optional[str], created_at=None, n: int = 1):
+        return self.add(status, project_type, created_at, -n)
+
+    def change_status(self, old: Optional[str], new: Optional[str], n: int = 1):
+        if (old or "pending") != (new or "pending"):
+            self.counts[("status", old or "pending")] -= n
+            self.counts[("status", new or "pending")] += n
+        return self
+
+    def items(self):
+        return [(key, n) for key, n in self.counts.items() if n]
+
+
+class ProjectStats:
+    """Applies deltas, serves the aggregates and reconciles them periodically"""
+
+    def __init__(self, request_model, stat_model, session_factory,
+                 reconcile_interval: float = STATS_RECONCILE_INTERVAL):
+        self.request_model = request_model
+        self.stat_model = stat_model
+        self.session_factory = session_factory
+        self.reconcile_interval = reconcile_interval
+        self.reconciled_at: Optional[datetime] = None
+        self.reconciles = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def apply(self, db, delta: StatsDelta):
+        """Add ``delta`` inside the caller's transaction (commit is up to the caller)"""
+        items = delta.items()
+        if not items:
+            return
+        stat = self.stat_model
+        upsert = UPSERT_INSERTS.get(db.bind.dialect.name)
+        if upsert is not None:
+            statement = upsert(stat)
+            statement = statement.on_conflict_do_update(
+                index_elements=["dimension", "value"], set_={"count": stat.count + statement.excluded.count}
+            )
+            await db.execute(statement, [{"dimension": d, "value": v, "count": n} for (d, v), n in items])
+            return
+        for (dimension, value), n in items:
+            result = await db.execute(
+                update(stat).where(stat.dimension == dimension, stat.value == value).values(count=stat.count + n)
+            )
+            if result.rowcount == 0:
+                await db.execute(insert(stat).values(dimension=dimension, value=value, count=n))
+
+    async def read(self, db, recent_days: int = STATS_RECENT_DAYS) -> dict:
+        stat = self.stat_model
+        today = datetime.now(timezone.utc).date()
+        first_day = today - timedelta(days=recent_days - 1)
+        rows = (await db.execute(select(stat.dimension, stat.value, stat.count).where(stat.count != 0))).all()
+
+        total = 0
+        by_status: Dict[str, int] = {}
+        by_project_type: Dict[str, int] = {}
+        per_day: Dict[str, int] = {}
+        for dimension, value, count in rows:
+            if dimension == "total":
+                total = count
+            elif dimension == "status":
+                by_status[value] = count
+            elif dimension == "project_type":
+                by_project_type[value or "unspecified"] = count
+            elif dimension == "day" and value >= first_day.isoformat():
+                per_day[value] = count
+        days = [(first_day + timedelta(days=i)).isoformat() for i in range(recent_days)]
+        return {
+            "total": total,
+            "by_status": by_status,
+            "by_project_type": by_project_type,
+            "recent": {
+                "days": recent_days,
+                "total": sum(per_day.values()),
+                "per_day": [{"date": day, "count": per_day.get(day, 0)} for day in days],
+            },
+            "reconciled_at": self.reconciled_at,
+        }
+
+    async def reconcile(self):
+        """Rebuild the summary table from the request table"""
+        model = self.request_model
+        async with self.session_factory() as db:
+            # Delete first so the transaction holds the write lock before it reads
+            await db.execute(delete(self.stat_model))
+            if db.bind.dialect.name == "sqlite":
+                day = func.date(model.created_at)
+            else:
+                day = cast(model.created_at, Date)
+            groups = await db.execute(
+                select(model.status, model.project_type, day, func.count())
+                .group_by(model.status, model.project_type, day)
+            )
+            delta = StatsDelta()
+            for status, project_type, created_on, n in groups:
+                delta.add(status, project_type, created_on, n)
+            items = delta.items()
+            if items:
+                await db.execute(
+                    insert(self.stat_model),
+                    [{"dimension": d, "value": v, "count": n} for (d, v), n in items]
+                )
+            await db.commit()
+        self.reconciled_at = datetime.now(timezone.utc)
+        self.reconciles += 1
+
+    def start(self):
+        if self.reconcile_interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"⚠️ Stats reconciliation failed: {e}")